@@ -6,22 +6,38 @@ Collects UI/UX evidence from target websites using Playwright.
 
 import argparse
 import asyncio
+import copy
+import hashlib
 import json
 import re
 import statistics
+import sys
+from array import array
 from collections import Counter, defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 try:
-    from playwright.async_api import async_playwright, Page, Browser, Request, Response
+    from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Request, Response
 except ImportError:
     print("ERROR: playwright not installed. Run: pip install playwright && playwright install chromium")
     raise SystemExit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 
 DEFAULT_BREAKPOINTS = {
     "desktop": {"width": 1440, "height": 900},
@@ -114,8 +130,17 @@ CANDIDATE_PROPS = [
     "opacity",
 ]
 
+CSS_KEYWORDS = {
+    "tailwind": ["--tw-", "@layer", "ring-", "prose-", "preflight"],
+    "bootstrap": ["--bs-", ".container", ".row", ".col-", ".btn"],
+    "antd": [".ant-", "--ant-"],
+    "mui": [".mui", "css-", "@emotion"],
+    "chakra": ["--chakra-"],
+    "radix": ["data-radix-", "[data-state"],
+}
+
 
-SYSTEM_FONTS = {
+SYSTEM_FONTS = frozenset({
     "-apple-system",
     "blinkmacsystemfont",
     "segoe ui",
@@ -129,7 +154,315 @@ SYSTEM_FONTS = {
     "ui-serif",
     "ui-monospace",
     "system-ui",
-}
+})
+
+PROBE_BATCH_SIZE = 8
+# Requests still awaiting a response before the oldest is logged without one.
+MAX_IN_FLIGHT_REQUESTS = 4096
+
+_SPACING_KEYS = (
+    "padding-top",
+    "padding-right",
+    "padding-bottom",
+    "padding-left",
+    "margin-top",
+    "margin-right",
+    "margin-bottom",
+    "margin-left",
+    "gap",
+)
+_NO_SENTINELS: FrozenSet[str] = frozenset()
+_ZERO_LENGTHS = frozenset({"0px", "0"})
+_ZERO_PX = frozenset({"0px"})
+_NONE_VALUES = frozenset({"none"})
+_ZERO_DURATIONS = frozenset({"0s"})
+_DEFAULT_EASINGS = frozenset({"ease"})
+_Z_SENTINELS = frozenset({"auto", "0"})
+
+# (computed property, token bucket, values that carry no token signal)
+_TOKEN_FIELDS: Tuple[Tuple[str, str, FrozenSet[str]], ...] = (
+    ("font-size", "font_sizes", _NO_SENTINELS),
+    ("line-height", "line_heights", _NO_SENTINELS),
+    ("letter-spacing", "letter_spacing", _NO_SENTINELS),
+    ("font-weight", "font_weights", _NO_SENTINELS),
+    *((key, "spacing", _ZERO_LENGTHS) for key in _SPACING_KEYS),
+    ("border-radius", "radius", _ZERO_PX),
+    ("border-width", "border_width", _ZERO_PX),
+    ("box-shadow", "shadow", _NONE_VALUES),
+    ("transition-duration", "motion_durations", _ZERO_DURATIONS),
+    ("transition-timing-function", "motion_easings", _DEFAULT_EASINGS),
+    ("z-index", "z_index", _Z_SENTINELS),
+)
+_TOKEN_BUCKETS = tuple(dict.fromkeys(bucket for _, bucket, _ in _TOKEN_FIELDS)) + (
+    "motion_properties",
+)
+
+_CONTROL_TYPES = frozenset({"button", "input", "chip"})
+
+_CTA_KEYWORDS = ("get started", "start", "free", "trial", "sign up", "register")
+_TRANSPARENT_BACKGROUNDS = frozenset({"rgba(0, 0, 0, 0)", "transparent"})
+
+_QUOTE_STRIP = str.maketrans("", "", "\"'")
+
+_FONT_WEIGHT_RE = re.compile(r"\s*(\d+)(?:\.\d*)?\s*$")
+_TPL_RE = re.compile(r"\{\{([^{}]+)\}\}")
+_SAFE_RE = re.compile(r"[^\w\-]")
+_HEX_RE = re.compile(r"#([0-9a-f]{3,8})")
+_HEX_DIGITS = {c: i for i, c in enumerate("0123456789abcdef")}
+# Zero-width lookahead so a match never consumes text another keyword starts
+# in. No keyword is a prefix of another, so each position reports at most one.
+_CSS_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(p.lower()) for patterns in CSS_KEYWORDS.values() for p in patterns) + "))"
+)
+
+_GET_HTML_JS = "() => document.documentElement.outerHTML"
+
+_GET_INLINE_STYLES_JS = """() => Array.from(document.querySelectorAll('style')).map(el => el.textContent || '')"""
+
+_EXTRACT_CSS_JS = """() => {
+    const urls = [];
+    document.querySelectorAll('link[rel="stylesheet"]').forEach(el => urls.push(el.href));
+    document.querySelectorAll('style').forEach(el => {
+        const matches = el.textContent.match(/@import\\s+url\\(['"]?([^'")]+)['"]?\\)/g);
+        if (matches) {
+            matches.forEach(m => {
+                const url = m.match(/@import\\s+url\\(['"]?([^'")]+)['"]?\\)/)[1];
+                urls.push(url);
+            });
+        }
+    });
+    return Array.from(new Set(urls));
+}"""
+
+_DEVICE_SCALE_JS = "() => window.devicePixelRatio || 1"
+
+_APPLY_THEME_JS = """(mode) => {
+    const root = document.documentElement;
+    root.setAttribute('data-theme', mode);
+    if (mode === 'dark') {
+        root.classList.add('dark');
+    }
+}"""
+
+# Page-side helpers installed once per browser context with add_init_script, so
+# the per-element evaluates below only ship a one-line call. The probe cache
+# memoizes computed property values, bounding rects (keyed on the scroll
+# position they were read at) and selector paths per DOM node. It is only
+# valid while the page is static; reset it after interacting with the page.
+_DS_HELPERS_JS = """window.__ds = (() => {
+    let cache = null;
+
+    function probeCache() {
+        return cache || (cache = {
+            style: new WeakMap(),
+            rect: new WeakMap(),
+            path: new WeakMap(),
+        });
+    }
+
+    function computedStyle(el, props) {
+        const computed = window.getComputedStyle(el);
+        const result = {};
+        props.forEach(p => { result[p] = computed.getPropertyValue(p); });
+        return result;
+    }
+
+    function cachedStyle(el, props) {
+        const styles = probeCache().style;
+        let entry = styles.get(el);
+        if (!entry) {
+            entry = Object.create(null);
+            styles.set(el, entry);
+        }
+        let style = null;
+        const result = {};
+        for (const p of props) {
+            if (!(p in entry)) {
+                style = style || window.getComputedStyle(el);
+                entry[p] = style.getPropertyValue(p);
+            }
+            result[p] = entry[p];
+        }
+        return result;
+    }
+
+    function cachedRect(el) {
+        const rects = probeCache().rect;
+        const scrollX = window.scrollX;
+        const scrollY = window.scrollY;
+        const hit = rects.get(el);
+        if (hit && hit.scrollX === scrollX && hit.scrollY === scrollY) {
+            return hit.rect;
+        }
+        const r = el.getBoundingClientRect();
+        const rect = {x: r.x, y: r.y, width: r.width, height: r.height};
+        rects.set(el, {scrollX, scrollY, rect});
+        return rect;
+    }
+
+    function selectorPath(el) {
+        const paths = probeCache().path;
+        const hit = paths.get(el);
+        if (hit !== undefined) {
+            return hit;
+        }
+        let path;
+        if (el.id) {
+            path = '#' + CSS.escape(el.id);
+        } else {
+            const parts = [];
+            let node = el;
+            let depth = 0;
+            while (node && node.nodeType === 1 && depth < 5) {
+                let selector = node.tagName.toLowerCase();
+                const classes = (node.className || '').toString().trim().split(/\\s+/).filter(Boolean);
+                if (classes.length) {
+                    selector += '.' + classes.slice(0, 2).map(c => CSS.escape(c)).join('.');
+                }
+                const siblings = node.parentElement ? Array.from(node.parentElement.children).filter(n => n.tagName === node.tagName) : [];
+                if (siblings.length > 1) {
+                    const index = siblings.indexOf(node) + 1;
+                    selector += `:nth-of-type(${index})`;
+                }
+                parts.unshift(selector);
+                node = node.parentElement;
+                depth += 1;
+            }
+            path = parts.join(' > ');
+        }
+        paths.set(el, path);
+        return path;
+    }
+
+    // Whether a crop of the full-page capture at the element's rect shows the
+    // element as painted: not fixed/sticky (a full-page capture places those
+    // elsewhere), not clipped by a scrolling or overflow-hidden ancestor, and
+    // not covered by another element when it is on screen.
+    function snapshotSafe(el, rect) {
+        const root = document.documentElement;
+        for (let node = el; node && node.nodeType === 1; node = node.parentElement) {
+            const style = cachedStyle(node, ['position', 'overflow-x', 'overflow-y']);
+            if (style.position === 'fixed' || style.position === 'sticky') {
+                return false;
+            }
+            if (node === el || node === root || node === document.body) {
+                continue;
+            }
+            if (style['overflow-x'] !== 'visible' || style['overflow-y'] !== 'visible') {
+                const box = node.getBoundingClientRect();
+                if (rect.x < box.left - 0.5 || rect.y < box.top - 0.5
+                    || rect.x + rect.width > box.right + 0.5
+                    || rect.y + rect.height > box.bottom + 0.5) {
+                    return false;
+                }
+            }
+        }
+        const cx = rect.x + rect.width / 2;
+        const cy = rect.y + rect.height / 2;
+        if (cx >= 0 && cy >= 0 && cx < window.innerWidth && cy < window.innerHeight) {
+            const hit = document.elementFromPoint(cx, cy);
+            if (hit && hit !== el && !el.contains(hit)) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    // One round-trip per element: visibility metadata, bbox, computed styles
+    // and selector path. With props=null only the metadata and bbox are read.
+    function probeElement(el, props) {
+        const style = cachedStyle(el, ['display', 'visibility', 'opacity']);
+        const result = {
+            text: (el.textContent || '').trim(),
+            role: el.getAttribute('role'),
+            aria_label: el.getAttribute('aria-label'),
+            display: style.display,
+            visibility: style.visibility,
+            opacity: style.opacity,
+            bbox: cachedRect(el),
+            // Scroll offset the bbox was read at, so crops from a full-page
+            // snapshot stay aligned even if the page scrolls afterwards.
+            scroll: [window.scrollX, window.scrollY],
+        };
+        if (props) {
+            result.computed = cachedStyle(el, props);
+            result.selector_path = selectorPath(el);
+            result.snapshot_safe = snapshotSafe(el, result.bbox);
+            const body = document.body;
+            result.page_size = [
+                Math.max(document.documentElement.scrollWidth, body ? body.scrollWidth : 0),
+                Math.max(document.documentElement.scrollHeight, body ? body.scrollHeight : 0),
+            ];
+        }
+        return result;
+    }
+
+    // Runs every selector of a group in one call. Elements matched by several
+    // selectors are kept once, tagged with the first selector that matched.
+    function queryGroup(selectors) {
+        const seen = new Set();
+        const elements = [];
+        const selectorIndex = [];
+        selectors.forEach((selector, i) => {
+            let nodes;
+            try {
+                nodes = document.querySelectorAll(selector);
+            } catch (e) {
+                return;
+            }
+            for (const el of nodes) {
+                if (seen.has(el)) continue;
+                seen.add(el);
+                elements.push(el);
+                selectorIndex.push(i);
+            }
+        });
+        elements.selectorIndex = selectorIndex;
+        return elements;
+    }
+
+    return {
+        computedStyle,
+        probeElement,
+        queryGroup,
+        reset: () => { cache = null; },
+    };
+})();"""
+
+_COMPUTED_STYLE_JS = "(el, props) => window.__ds.computedStyle(el, props)"
+
+_PROBE_ELEMENT_JS = "(el, props) => window.__ds.probeElement(el, props)"
+
+_QUERY_GROUP_JS = "(selectors) => window.__ds.queryGroup(selectors)"
+
+_RESET_PROBE_CACHE_JS = "() => window.__ds.reset()"
+
+_FONT_PROBES_JS = """({selectorMap, props}) => {
+    const out = {};
+    for (const [probe, selectors] of Object.entries(selectorMap)) {
+        for (const selector of selectors) {
+            for (const el of document.querySelectorAll(selector)) {
+                const rect = el.getBoundingClientRect();
+                if (rect.width < 24 || rect.height < 24) continue;
+                const style = window.getComputedStyle(el);
+                if (style.display === 'none' || style.visibility === 'hidden') continue;
+                const opacity = parseFloat(style.opacity);
+                if (!Number.isNaN(opacity) && opacity <= 0) continue;
+                const styles = {};
+                props.forEach(p => { styles[p] = style.getPropertyValue(p); });
+                out[probe] = {
+                    selector,
+                    text: (el.textContent || '').trim(),
+                    bbox: {x: rect.x, y: rect.y, width: rect.width, height: rect.height},
+                    styles,
+                };
+                break;
+            }
+            if (out[probe]) break;
+        }
+    }
+    return out;
+}"""
 
 
 def extract_site_name(base_url: str) -> str:
@@ -147,12 +480,11 @@ def now_iso() -> str:
 
 
 def normalize_text(text: str, limit: int = 140) -> str:
-    clean = re.sub(r"\s+", " ", text or "").strip()
-    return clean[:limit]
+    return " ".join((text or "").split())[:limit]
 
 
 def safe_filename(value: str) -> str:
-    return re.sub(r"[^\w\-]", "_", value)
+    return _SAFE_RE.sub("_", value)
 
 
 def parse_breakpoints(raw: Optional[str]) -> Dict[str, Dict[str, int]]:
@@ -180,119 +512,180 @@ def parse_theme_modes(raw: Optional[str]) -> List[str]:
     modes = [m.strip() for m in raw.split(",") if m.strip()]
     return modes or ["default"]
 
-def parse_selected_paths(raw: Optional[str]) -> List[str]:
+def parse_selected_paths(raw: Optional[str]) -> FrozenSet[str]:
     if not raw:
-        return []
+        return frozenset()
     path = Path(raw)
-    if not path.exists():
-        return []
     try:
-        data = json.loads(read_text(path))
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return frozenset()
+    try:
+        return load_selected_paths(str(path.resolve()), mtime_ns)
     except Exception:
-        return []
+        return frozenset()
+
+
+@lru_cache(maxsize=8)
+def load_selected_paths(path: str, mtime_ns: int) -> FrozenSet[str]:
+    # Raises on unreadable or unrecognized files so lru_cache only keeps
+    # successful loads; parse_selected_paths maps failures to an empty set.
+    data = read_json(Path(path))
     if isinstance(data, list):
         if data and isinstance(data[0], str):
-            return [s for s in data if isinstance(s, str)]
+            return frozenset(s for s in data if isinstance(s, str))
         if data and isinstance(data[0], dict):
-            paths = []
+            paths = set()
             for item in data:
                 if not isinstance(item, dict):
                     continue
                 selector_path = item.get("selector_path")
                 selector = item.get("selector")
                 if selector_path:
-                    paths.append(selector_path)
+                    paths.add(selector_path)
                 elif selector:
-                    paths.append(selector)
-            return paths
-    return []
+                    paths.add(selector)
+            return frozenset(paths)
+        if not data:
+            return frozenset()
+    raise ValueError(f"unrecognized selected paths file: {path}")
 
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
+def read_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(read_text(path))
+
+
 def write_text(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
 def write_json(path: Path, data: Any) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    write_text(path, json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def dumps_line(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
 
 
 def flatten_values(values: List[Any]) -> List[Any]:
-    out = []
-    for v in values:
-        if isinstance(v, list):
-            out.extend(v)
-        else:
-            out.append(v)
-    return out
-
-
-def rgba_to_hsl(r: float, g: float, b: float) -> Tuple[float, float, float]:
-    r /= 255.0
-    g /= 255.0
-    b /= 255.0
-    maxc = max(r, g, b)
-    minc = min(r, g, b)
-    l = (minc + maxc) / 2.0
-    if minc == maxc:
-        return 0.0, 0.0, l
-    if l <= 0.5:
-        s = (maxc - minc) / (maxc + minc)
-    else:
-        s = (maxc - minc) / (2.0 - maxc - minc)
-    rc = (maxc - r) / (maxc - minc)
-    gc = (maxc - g) / (maxc - minc)
-    bc = (maxc - b) / (maxc - minc)
-    if r == maxc:
-        h = bc - gc
-    elif g == maxc:
-        h = 2.0 + rc - bc
+    return list(chain.from_iterable(v if isinstance(v, list) else (v,) for v in values))
+
+
+def iter_at_rule_blocks(css_text: str, name: str = "@font-face"):
+    # Match on the original text: str.lower() can change length, which would
+    # shift offsets taken from a lowered copy.
+    find = re.compile(re.escape(name), re.IGNORECASE).search
+    length = len(css_text)
+    match = find(css_text)
+    while match:
+        idx = match.end()
+        while idx < length and css_text[idx].isspace():
+            idx += 1
+        if idx >= length or css_text[idx] != "{":
+            match = find(css_text, idx)
+            continue
+        start = idx + 1
+        depth = 1
+        idx = start
+        while depth:
+            close = css_text.find("}", idx)
+            if close == -1:
+                return
+            opened = css_text.find("{", idx, close)
+            if opened == -1:
+                depth -= 1
+                idx = close + 1
+            else:
+                depth += 1
+                idx = opened + 1
+        yield css_text[start:idx - 1]
+        match = find(css_text, idx)
+
+
+def iter_declarations(block: str):
+    start = 0
+    colon = -1
+    quote = ""
+    parens = 0
+    for idx, char in enumerate(block):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in {'"', "'"}:
+            quote = char
+        elif char == "(":
+            parens += 1
+        elif char == ")":
+            parens = max(0, parens - 1)
+        elif parens:
+            continue
+        elif char == ":" and colon == -1:
+            colon = idx
+        elif char == ";":
+            if colon != -1:
+                yield block[start:colon].strip().lower(), block[colon + 1:idx].strip()
+            start = idx + 1
+            colon = -1
+    if colon != -1:
+        yield block[start:colon].strip().lower(), block[colon + 1:].strip()
+
+
+def _parse_hex(digits: str) -> Optional[Tuple[int, int, int, float]]:
+    if len(digits) in {3, 4}:
+        channels = [_HEX_DIGITS[c] * 17 for c in digits]
+    elif len(digits) in {6, 8}:
+        channels = [_HEX_DIGITS[digits[i]] * 16 + _HEX_DIGITS[digits[i + 1]] for i in range(0, len(digits), 2)]
     else:
-        h = 4.0 + gc - rc
-    h = (h / 6.0) % 1.0
-    return h * 360.0, s, l
+        return None
+    a = channels[3] / 255.0 if len(channels) == 4 else 1.0
+    return channels[0], channels[1], channels[2], a
 
 
+@lru_cache(maxsize=4096)
 def parse_color(value: str) -> Optional[Tuple[int, int, int, float]]:
     if not value:
         return None
     value = value.strip().lower()
     if value in {"transparent", "none"}:
         return None
-    rgba_match = re.match(r"rgba?\(([^)]+)\)", value)
-    if rgba_match:
-        parts = [p.strip() for p in rgba_match.group(1).split(",")]
-        if len(parts) >= 3:
-            try:
-                r = int(float(parts[0]))
-                g = int(float(parts[1]))
-                b = int(float(parts[2]))
-                a = float(parts[3]) if len(parts) > 3 else 1.0
-                return r, g, b, a
-            except ValueError:
-                return None
-    hex_match = re.match(r"#([0-9a-f]{3,8})", value)
-    if hex_match:
-        h = hex_match.group(1)
-        if len(h) in {3, 4}:
-            r = int(h[0] * 2, 16)
-            g = int(h[1] * 2, 16)
-            b = int(h[2] * 2, 16)
-            a = int(h[3] * 2, 16) / 255.0 if len(h) == 4 else 1.0
-            return r, g, b, a
-        if len(h) in {6, 8}:
-            r = int(h[0:2], 16)
-            g = int(h[2:4], 16)
-            b = int(h[4:6], 16)
-            a = int(h[6:8], 16) / 255.0 if len(h) == 8 else 1.0
+    if value.startswith(("rgb(", "rgba(")):
+        open_idx = value.index("(")
+        close_idx = value.find(")", open_idx + 1)
+        if close_idx <= open_idx + 1:
+            return None
+        parts = [p.strip() for p in value[open_idx + 1:close_idx].split(",")]
+        if len(parts) < 3:
+            return None
+        try:
+            r = min(255, max(0, int(float(parts[0]))))
+            g = min(255, max(0, int(float(parts[1]))))
+            b = min(255, max(0, int(float(parts[2]))))
+            a = float(parts[3]) if len(parts) > 3 else 1.0
             return r, g, b, a
+        except ValueError:
+            return None
+    if not value.startswith("#"):
+        return None
+    if len(value) in {4, 5, 7, 9} and all(c in _HEX_DIGITS for c in value[1:]):
+        return _parse_hex(value[1:])
+    hex_match = _HEX_RE.match(value)
+    if hex_match:
+        return _parse_hex(hex_match.group(1))
     return None
 
 
+@lru_cache(maxsize=4096)
 def color_to_string(rgba: Tuple[int, int, int, float]) -> str:
     r, g, b, a = rgba
     if a >= 0.999:
@@ -300,71 +693,183 @@ def color_to_string(rgba: Tuple[int, int, int, float]) -> str:
     return f"rgba({r}, {g}, {b}, {round(a, 3)})"
 
 
+@lru_cache(maxsize=4096)
 def color_is_neutral(rgba: Tuple[int, int, int, float]) -> bool:
-    h, s, _ = rgba_to_hsl(rgba[0], rgba[1], rgba[2])
-    return s < 0.18 or h is None
+    maxc = max(rgba[0], rgba[1], rgba[2]) / 255.0
+    minc = min(rgba[0], rgba[1], rgba[2]) / 255.0
+    if maxc == minc:
+        return True
+    if (minc + maxc) / 2.0 <= 0.5:
+        saturation = (maxc - minc) / (maxc + minc)
+    else:
+        saturation = (maxc - minc) / (2.0 - maxc - minc)
+    return saturation < 0.18
 
 
+@lru_cache(maxsize=4096)
 def parse_length(value: str, root_font_size: float = 16.0) -> Optional[float]:
     if not value:
         return None
     value = value.strip().lower()
     if value in {"auto", "normal", "none"}:
         return None
-    if value.endswith("px"):
-        try:
-            return float(value.replace("px", ""))
-        except ValueError:
-            return None
-    if value.endswith("rem"):
-        try:
-            return float(value.replace("rem", "")) * root_font_size
-        except ValueError:
-            return None
-    if value.endswith("em"):
-        try:
-            return float(value.replace("em", "")) * root_font_size
-        except ValueError:
-            return None
     if value.endswith("%"):
         return None
+    if value.endswith("px"):
+        number, scale = value[:-2], 1.0
+    elif value.endswith("rem"):
+        number, scale = value[:-3], root_font_size
+    elif value.endswith("em"):
+        number, scale = value[:-2], root_font_size
+    else:
+        number, scale = value, 1.0
     try:
-        return float(value)
+        return float(number) * scale
     except ValueError:
         return None
 
 
+@lru_cache(maxsize=4096)
 def parse_duration(value: str) -> Optional[float]:
     if not value:
         return None
     value = value.strip().lower()
     if value.endswith("ms"):
-        try:
-            return float(value.replace("ms", ""))
-        except ValueError:
-            return None
-    if value.endswith("s"):
-        try:
-            return float(value.replace("s", "")) * 1000.0
-        except ValueError:
-            return None
-    return None
+        number, scale = value[:-2], 1.0
+    elif value.endswith("s"):
+        number, scale = value[:-1], 1000.0
+    else:
+        return None
+    try:
+        return float(number) * scale
+    except ValueError:
+        return None
 
 
-def contrast_ratio(fg: Tuple[int, int, int], bg: Tuple[int, int, int]) -> float:
-    def channel(c: int) -> float:
-        c = c / 255.0
-        return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+@lru_cache(maxsize=64)
+def parse_font_weight(value: str) -> Optional[int]:
+    match = _FONT_WEIGHT_RE.match(value or "")
+    return int(match.group(1)) if match else None
+
+
+def srgb_channel_luminance(c: int) -> float:
+    c = c / 255.0
+    return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+
+_LUM_LUT = tuple(srgb_channel_luminance(c) for c in range(256))
+
 
-    lum_fg = 0.2126 * channel(fg[0]) + 0.7152 * channel(fg[1]) + 0.0722 * channel(fg[2])
-    lum_bg = 0.2126 * channel(bg[0]) + 0.7152 * channel(bg[1]) + 0.0722 * channel(bg[2])
+@lru_cache(maxsize=4096)
+def relative_luminance(r: int, g: int, b: int) -> float:
+    return 0.2126 * _LUM_LUT[r] + 0.7152 * _LUM_LUT[g] + 0.0722 * _LUM_LUT[b]
+
+
+@lru_cache(maxsize=4096)
+def contrast_ratio(fg: Tuple[int, int, int], bg: Tuple[int, int, int]) -> float:
+    if fg == bg:
+        return 1.0
+    lum_fg = relative_luminance(*fg)
+    lum_bg = relative_luminance(*bg)
     lighter = max(lum_fg, lum_bg)
     darker = min(lum_fg, lum_bg)
     return (lighter + 0.05) / (darker + 0.05)
 
 
+def candidate_meta(raw: Dict[str, Any], allow_empty_text: bool = False) -> Optional[Dict[str, Any]]:
+    box = raw.get("bbox")
+    if not box or box["width"] < 24 or box["height"] < 24:
+        return None
+    if raw.get("display") == "none" or raw.get("visibility") == "hidden":
+        return None
+    try:
+        opacity_val = float(raw.get("opacity") or "1")
+    except ValueError:
+        opacity_val = 1.0
+    if opacity_val <= 0:
+        return None
+
+    # Interned so dedupe keys built from repeated labels ("Learn more") compare by identity.
+    text = sys.intern(normalize_text(raw.get("text", "")))
+    if not allow_empty_text and not text and not raw.get("role") and not raw.get("aria_label"):
+        return None
+
+    return {
+        "text": text,
+        "role": raw.get("role"),
+        "aria_label": raw.get("aria_label"),
+        "bbox": box,
+        "scroll": raw.get("scroll") or (0, 0),
+        "snapshot_safe": bool(raw.get("snapshot_safe")),
+        "page_size": raw.get("page_size"),
+    }
+
+
+def snapshot_box(snapshot: Dict[str, Any], meta: Dict[str, Any]) -> Optional[Tuple[int, int, int, int]]:
+    """Map a probed element onto the full-page snapshot, or None when the crop would be wrong.
+
+    Elements the page reported as not snapshot-safe (fixed/sticky, clipped or
+    covered) are skipped, as are probes taken after the document was resized
+    since the capture.
+    """
+    if not meta.get("snapshot_safe") or not meta.get("page_size"):
+        return None
+    image = snapshot["image"]
+    scale = snapshot["scale"]
+    page_width, page_height = meta["page_size"]
+    if abs(page_width * scale - image.width) > scale + 1 or abs(page_height * scale - image.height) > scale + 1:
+        return None
+    bbox = meta["bbox"]
+    scroll_x, scroll_y = meta["scroll"]
+    left = max(0, round((bbox["x"] + scroll_x) * scale))
+    top = max(0, round((bbox["y"] + scroll_y) * scale))
+    right = min(image.width, round((bbox["x"] + bbox["width"] + scroll_x) * scale))
+    bottom = min(image.height, round((bbox["y"] + bbox["height"] + scroll_y) * scale))
+    if right <= left or bottom <= top:
+        return None
+    return left, top, right, bottom
+
+
+@lru_cache(maxsize=8)
+def compile_template(template: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split a template into its literal runs and the placeholder keys between them."""
+    parts = _TPL_RE.split(template)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+
+def render_template(template: str, replacements: Dict[str, Any]) -> str:
+    """Fill {{key}} placeholders; unknown placeholders are left as-is."""
+    literals, keys = compile_template(template)
+    out = [literals[0]]
+    for key, literal in zip(keys, literals[1:]):
+        out.append(str(replacements[key]) if key in replacements else "{{" + key + "}}")
+        out.append(literal)
+    return "".join(out)
+
+
+async def iter_probed(elements: List[Any], probe, batch_size: int = PROBE_BATCH_SIZE):
+    """Yield (element, probe result) pairs, probing each batch concurrently."""
+    for start in range(0, len(elements), batch_size):
+        batch = elements[start:start + batch_size]
+        results = await asyncio.gather(*(probe(el) for el in batch))
+        for item in zip(batch, results):
+            yield item
+
+
 @dataclass
 class NetworkEntry:
+    __slots__ = (
+        "url",
+        "method",
+        "resource_type",
+        "status",
+        "content_type",
+        "initiator",
+        "page_tag",
+        "breakpoint",
+        "theme",
+    )
+
     url: str
     method: str
     resource_type: str
@@ -375,17 +880,39 @@ class NetworkEntry:
     breakpoint: str
     theme: str
 
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class PageResult:
+    page_key: str
+    page: Dict[str, Any] = field(default_factory=dict)
+    samples: List[Dict[str, Any]] = field(default_factory=list)
+    candidates: List[Dict[str, Any]] = field(default_factory=list)
+    font_faces: List[Dict[str, Any]] = field(default_factory=list)
+    font_probes: List[Dict[str, Any]] = field(default_factory=list)
+    reduced_motion: bool = False
+    tech_stack: Optional[Dict[str, Any]] = None
+
 
 class NetworkLogger:
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
         ensure_dir(output_dir)
-        self.entries: List[NetworkEntry] = []
-        self._request_map: Dict[int, int] = {}
+        self.network_path = output_dir / "requests.jsonl"
+        self.count = 0
+        self.font_entries: List[Dict[str, Any]] = []
+        self._stream = None
+        # Strong references: entries must survive until a response/failure or
+        # write() flushes them. Oldest entries are emitted early past the cap.
+        self._in_flight: Dict[Request, NetworkEntry] = {}
 
     def attach(self, page: Page, page_tag: str, breakpoint: str, theme: str):
         async def on_request(request: Request):
-            entry = NetworkEntry(
+            if len(self._in_flight) >= MAX_IN_FLIGHT_REQUESTS:
+                self.emit(self._in_flight.pop(next(iter(self._in_flight))))
+            self._in_flight[request] = NetworkEntry(
                 url=request.url,
                 method=request.method,
                 resource_type=request.resource_type,
@@ -399,50 +926,63 @@ class NetworkLogger:
                 breakpoint=breakpoint,
                 theme=theme,
             )
-            self.entries.append(entry)
-            self._request_map[id(request)] = len(self.entries) - 1
 
         async def on_response(response: Response):
-            req = response.request
-            idx = self._request_map.get(id(req))
-            if idx is None:
+            entry = self._in_flight.pop(response.request, None)
+            if entry is None:
                 return
-            self.entries[idx].status = response.status
-            self.entries[idx].content_type = response.headers.get("content-type", "")
+            entry.status = response.status
+            entry.content_type = response.headers.get("content-type", "")
+            self.emit(entry)
+
+        async def on_request_failed(request: Request):
+            entry = self._in_flight.pop(request, None)
+            if entry is not None:
+                self.emit(entry)
 
         page.on("request", on_request)
         page.on("response", on_response)
-
-    def classify_fonts(self) -> List[Dict[str, Any]]:
-        fonts = []
-        for entry in self.entries:
-            url = entry.url.split("?")[0].lower()
-            content_type = (entry.content_type or "").lower()
-            is_font = url.endswith((".woff", ".woff2", ".ttf", ".otf")) or "font" in content_type
-            if is_font:
-                fonts.append({
-                    "url": entry.url,
-                    "status": entry.status,
-                    "content_type": entry.content_type,
-                    "initiator": entry.initiator,
-                    "page_tag": entry.page_tag,
-                    "breakpoint": entry.breakpoint,
-                    "theme": entry.theme,
-                })
-        return fonts
+        page.on("requestfailed", on_request_failed)
+
+    def emit(self, entry: NetworkEntry) -> None:
+        if self._stream is None:
+            self._stream = open(self.network_path, "wb")
+        self._stream.write(dumps_line(entry.as_dict()))
+        self.count += 1
+        font = self.classify_font(entry)
+        if font:
+            self.font_entries.append(font)
+
+    def classify_font(self, entry: NetworkEntry) -> Optional[Dict[str, Any]]:
+        url = entry.url.split("?")[0].lower()
+        content_type = (entry.content_type or "").lower()
+        is_font = url.endswith((".woff", ".woff2", ".ttf", ".otf")) or "font" in content_type
+        if not is_font:
+            return None
+        return {
+            "url": entry.url,
+            "status": entry.status,
+            "content_type": entry.content_type,
+            "initiator": entry.initiator,
+            "page_tag": entry.page_tag,
+            "breakpoint": entry.breakpoint,
+            "theme": entry.theme,
+        }
 
     def write(self) -> Tuple[Path, Path]:
-        network_path = self.output_dir / "requests.jsonl"
         font_path = self.output_dir.parent / "fonts" / "font-requests.json"
         ensure_dir(font_path.parent)
 
-        with open(network_path, "w", encoding="utf-8") as f:
-            for entry in self.entries:
-                f.write(json.dumps(entry.__dict__, ensure_ascii=False) + "\n")
+        for entry in list(self._in_flight.values()):
+            self.emit(entry)
+        self._in_flight.clear()
+        if self._stream is None:
+            self._stream = open(self.network_path, "wb")
+        self._stream.close()
+        self._stream = None
 
-        font_items = self.classify_fonts()
-        write_json(font_path, {"count": len(font_items), "items": font_items})
-        return network_path, font_path
+        write_json(font_path, {"count": len(self.font_entries), "items": self.font_entries})
+        return self.network_path, font_path
 
 
 class DesignSystemCollector:
@@ -456,8 +996,10 @@ class DesignSystemCollector:
         breakpoints: Optional[Dict[str, Dict[str, int]]] = None,
         skip_overlays: bool = False,
         candidates_only: bool = False,
-        selected_paths: Optional[List[str]] = None,
+        selected_paths: Optional[Iterable[str]] = None,
         allow_anchor_active: bool = False,
+        max_parallel: int = 3,
+        state_workers: int = 2,
     ):
         self.base_url = base_url.rstrip("/")
         self.home_path = home_path
@@ -468,6 +1010,7 @@ class DesignSystemCollector:
         self.output_dir = Path(output_dir)
         self.artifacts_dir = self.output_dir / "artifacts"
         self.templates_dir = Path(__file__).resolve().parent.parent / "templates"
+        self._results_template: Dict[str, Any] = read_json(self.templates_dir / "results.json")
 
         self.screenshots_dir = self.artifacts_dir / "screenshots"
         self.html_dir = self.artifacts_dir / "html"
@@ -492,6 +1035,19 @@ class DesignSystemCollector:
         self.network_logger = NetworkLogger(self.network_dir)
 
         self.samples: List[Dict[str, Any]] = []
+        # Samples bucketed by component_type; key order is first-seen order.
+        self._by_type: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        # bbox sizes parallel to self.samples (0.0 when missing) for size scans.
+        self._widths = array("d")
+        self._heights = array("d")
+        # Sorted non-empty keys of _by_type; cleared whenever samples are ingested.
+        self._component_types: Optional[List[str]] = None
+        # Parsed form of every distinct color string in _raw_colors; cleared on ingest.
+        self._color_table: Optional[Dict[str, Optional[Tuple[int, int, int, float]]]] = None
+        # Token counters fed by _ingest_sample as pages merge; Counters keep
+        # first-seen order, so most_common() ties match a single post-pass.
+        self._raw_colors: Counter = Counter()
+        self._token_counts: Dict[str, Counter] = {name: Counter() for name in _TOKEN_BUCKETS}
         self.candidates: List[Dict[str, Any]] = []
         self.pages: Dict[str, Dict[str, Any]] = {}
         self.font_faces: List[Dict[str, Any]] = []
@@ -502,8 +1058,13 @@ class DesignSystemCollector:
         self.reduced_motion_detected: bool = False
         self.skip_overlays: bool = skip_overlays
         self.candidates_only: bool = candidates_only
-        self.selected_selector_paths = set(selected_paths or [])
+        self.selected_selector_paths = frozenset(selected_paths or ())
         self.allow_anchor_active: bool = allow_anchor_active
+        self.max_parallel: int = max(1, max_parallel)
+        self.state_workers: int = max(1, state_workers)
+
+        self._content_paths: Dict[str, Path] = {}
+        self._font_face_cache: Dict[str, List[Dict[str, Any]]] = {}
 
         self.evidence_paths = {
             "screenshots": set(),
@@ -523,20 +1084,43 @@ class DesignSystemCollector:
             if self.nav_path:
                 pages_to_collect.append(("nav", self.nav_path))
 
-            for theme in self.theme_modes:
-                for page_name, path in pages_to_collect:
-                    for bp_name, bp_config in self.breakpoints.items():
-                        await self.collect_page(
-                            browser=browser,
-                            page_name=page_name,
-                            path=path,
-                            breakpoint=bp_name,
-                            bp_config=bp_config,
-                            theme_mode=theme,
-                        )
+            # Each (theme, breakpoint) job owns one BrowserContext shared by its pages,
+            # so jobs can run concurrently; results are merged in a fixed order afterwards.
+            semaphore = asyncio.Semaphore(self.max_parallel)
+
+            async def run_job(theme: str, bp_name: str, bp_config: Dict[str, int]) -> List[PageResult]:
+                async with semaphore:
+                    return await self.collect_viewport(
+                        browser=browser,
+                        pages_to_collect=pages_to_collect,
+                        breakpoint=bp_name,
+                        bp_config=bp_config,
+                        theme_mode=theme,
+                    )
+
+            jobs = [
+                run_job(theme, bp_name, bp_config)
+                for theme in self.theme_modes
+                for bp_name, bp_config in self.breakpoints.items()
+            ]
+            job_results = await asyncio.gather(*jobs, return_exceptions=True)
 
             await browser.close()
 
+        page_results: Dict[str, PageResult] = {}
+        for job_result in job_results:
+            if isinstance(job_result, BaseException):
+                self.limits.append(f"Page collection task failed: {job_result}")
+                continue
+            for page_result in job_result:
+                page_results[page_result.page_key] = page_result
+        for theme in self.theme_modes:
+            for page_name, _ in pages_to_collect:
+                for bp_name in self.breakpoints:
+                    page_result = page_results.get(f"{page_name}_{bp_name}_{theme}")
+                    if page_result:
+                        self.merge_page_result(page_result)
+
         network_path, font_request_path = self.network_logger.write()
         self.evidence_paths["network"].add(str(network_path.relative_to(self.output_dir)))
         self.evidence_paths["fonts"].add(str(font_request_path.relative_to(self.output_dir)))
@@ -577,25 +1161,111 @@ class DesignSystemCollector:
         print(f"Artifacts: {self.artifacts_dir}")
         print(f"Report: {report_path}")
 
-    async def collect_page(
+    def write_text_once(self, path: Path, content: str) -> Tuple[Path, str]:
+        digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+        existing = self._content_paths.get(digest)
+        if existing is not None:
+            return existing, digest
+        write_text(path, content)
+        self._content_paths[digest] = path
+        return path, digest
+
+    def ingest_samples(self, samples: List[Dict[str, Any]]) -> None:
+        self.samples.extend(samples)
+        self._component_types = None
+        self._color_table = None
+        for sample in samples:
+            self._by_type.setdefault(sample.get("component_type"), []).append(sample)
+            bbox = sample.get("bbox") or {}
+            self._widths.append(bbox.get("width") or 0.0)
+            self._heights.append(bbox.get("height") or 0.0)
+            self._ingest_sample(sample)
+
+    def component_types(self) -> List[str]:
+        if self._component_types is None:
+            self._component_types = sorted(t for t in self._by_type if t)
+        return self._component_types
+
+    def color_table(self) -> Dict[str, Optional[Tuple[int, int, int, float]]]:
+        if self._color_table is None:
+            self._color_table = {raw: parse_color(raw) for raw in self._raw_colors}
+        return self._color_table
+
+    def _ingest_sample(self, sample: Dict[str, Any]) -> None:
+        computed = sample.get("computed", {})
+        if not computed:
+            return
+        get = computed.get
+
+        self._raw_colors.update((
+            get("color", ""),
+            get("background-color", ""),
+            get("border-color", ""),
+            get("outline-color", ""),
+        ))
+
+        counts = self._token_counts
+        for key, bucket, skip in _TOKEN_FIELDS:
+            val = get(key)
+            if val and val not in skip:
+                counts[bucket][val.strip()] += 1
+
+        props = get("transition-property")
+        if props and props != "all":
+            counts["motion_properties"].update(prop for prop in map(str.strip, props.split(",")) if prop)
+
+    def merge_page_result(self, result: PageResult) -> None:
+        self.pages[result.page_key] = result.page
+        self.ingest_samples(result.samples)
+        self.candidates.extend(result.candidates)
+        self.font_faces.extend(result.font_faces)
+        self.font_probes.extend(result.font_probes)
+        self.reduced_motion_detected = self.reduced_motion_detected or result.reduced_motion
+        if result.tech_stack is not None:
+            self.tech_stack = result.tech_stack
+
+    async def collect_viewport(
         self,
         browser: Browser,
+        pages_to_collect: List[Tuple[str, str]],
+        breakpoint: str,
+        bp_config: Dict[str, int],
+        theme_mode: str,
+    ) -> List[PageResult]:
+        context = await browser.new_context(
+            viewport=bp_config,
+            device_scale_factor=1,
+            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        )
+        try:
+            await context.add_init_script(_DS_HELPERS_JS)
+            return [
+                await self.collect_page(
+                    context=context,
+                    page_name=page_name,
+                    path=path,
+                    breakpoint=breakpoint,
+                    theme_mode=theme_mode,
+                )
+                for page_name, path in pages_to_collect
+            ]
+        finally:
+            await context.close()
+
+    async def collect_page(
+        self,
+        context: BrowserContext,
         page_name: str,
         path: str,
         breakpoint: str,
-        bp_config: Dict[str, int],
         theme_mode: str,
-    ) -> None:
+    ) -> PageResult:
         url = urljoin(self.base_url, path)
         safe_tag = safe_filename(f"{page_name}_{breakpoint}_{theme_mode}")
         page_key = f"{page_name}_{breakpoint}_{theme_mode}"
+        result = PageResult(page_key=page_key)
         stage = "init"
 
-        context = await browser.new_context(
-            viewport=bp_config,
-            device_scale_factor=1,
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        )
         page = await context.new_page()
         self.network_logger.attach(page, page_tag=page_name, breakpoint=breakpoint, theme=theme_mode)
 
@@ -616,7 +1286,7 @@ class DesignSystemCollector:
             await self.apply_theme_mode(page, theme_mode)
 
             stage = "screenshots"
-            await self.capture_screenshots(page, safe_tag)
+            full_path = await self.capture_screenshots(page, safe_tag)
             stage = "save_html"
             html_path = await self.save_html(page, safe_tag)
 
@@ -628,23 +1298,24 @@ class DesignSystemCollector:
             inline_font_faces, inline_css_texts = await self.collect_inline_font_faces(page, safe_tag)
             for face in css_font_faces + inline_font_faces:
                 face["page"] = page_key
-                self.font_faces.append(face)
-            self.reduced_motion_detected = self.reduced_motion_detected or self.scan_reduced_motion(css_texts + inline_css_texts)
+                result.font_faces.append(face)
+            result.reduced_motion = self.scan_reduced_motion(css_texts + inline_css_texts)
 
             stage = "font_probes"
             font_probes = await self.collect_font_probes(page, safe_tag, page_key)
-            self.font_probes.extend(font_probes)
+            result.font_probes.extend(font_probes)
 
             if page_name == "home" and breakpoint == "desktop" and theme_mode == "default":
                 stage = "tech_fingerprint"
-                self.tech_stack = await self.collect_tech_fingerprint(page, css_data)
+                result.tech_stack = await self.collect_tech_fingerprint(page, css_data)
 
             stage = "collect_candidates"
-            candidates = await self.collect_candidates(page, page_name, breakpoint, theme_mode, safe_tag)
-            self.candidates.extend(candidates)
+            snapshot = await self.snapshot_page(page, full_path)
+            candidates = await self.collect_candidates(page, page_name, breakpoint, theme_mode, safe_tag, snapshot)
+            result.candidates.extend(candidates)
 
             if self.candidates_only:
-                self.pages[page_key] = {
+                result.page = {
                     "url": url,
                     "html": str(html_path.relative_to(self.output_dir)),
                     "css": css_data,
@@ -652,10 +1323,12 @@ class DesignSystemCollector:
                     "candidates": [c.get("id") for c in candidates],
                     "font_probes_count": len(font_probes),
                 }
-                return
+                return result
 
             stage = "collect_samples"
-            samples = await self.collect_samples(page, page_name, breakpoint, theme_mode, safe_tag)
+            samples = await self.collect_samples(page, page_name, breakpoint, theme_mode, safe_tag, snapshot)
+            # Release the decoded capture before overlay and state sampling.
+            snapshot = None
             if self.selected_selector_paths:
                 samples = [
                     s for s in samples
@@ -666,11 +1339,11 @@ class DesignSystemCollector:
                 stage = "collect_overlays"
                 await self.collect_overlay_samples(page, page_name, breakpoint, theme_mode, safe_tag, samples)
             stage = "collect_states"
-            await self.collect_states(page, samples)
-            self.samples.extend(samples)
+            await self.collect_states(page, samples, context, url, theme_mode)
+            result.samples.extend(samples)
 
             stage = "page_finalize"
-            self.pages[page_key] = {
+            result.page = {
                 "url": url,
                 "html": str(html_path.relative_to(self.output_dir)),
                 "css": css_data,
@@ -679,30 +1352,52 @@ class DesignSystemCollector:
             }
 
         except Exception as exc:
-            self.pages[page_key] = {"url": url, "error": str(exc), "stage": stage}
+            result.page = {"url": url, "error": str(exc), "stage": stage}
             self.limits.append(f"Failed to collect {page_key} at {stage}: {exc}")
         finally:
-            await context.close()
+            await page.close()
+        return result
+
+    async def open_state_page(self, context: BrowserContext, url: str, theme_mode: str) -> Optional[Page]:
+        """Open and settle an extra tab for state sampling, or None if it fails.
 
-    async def apply_theme_mode(self, page: Page, theme_mode: str) -> None:
+        The tab is not attached to the network logger, so requests.jsonl only
+        records the main page's traffic.
+        """
+        try:
+            page = await context.new_page()
+        except Exception:
+            return None
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            await page.wait_for_selector("body", state="attached", timeout=15000)
+            try:
+                await page.wait_for_load_state("networkidle", timeout=15000)
+            except Exception:
+                pass
+            await page.wait_for_timeout(2000)
+            # The main page already reported a theme failure; a tab without the
+            # theme would sample the wrong styles, so drop it instead.
+            if await self.apply_theme_mode(page, theme_mode, record_limit=False):
+                return page
+        except Exception:
+            pass
+        await page.close()
+        return None
+
+    async def apply_theme_mode(self, page: Page, theme_mode: str, record_limit: bool = True) -> bool:
         if theme_mode == "default":
-            return
+            return True
         try:
-            await page.evaluate(
-                """(mode) => {
-                    const root = document.documentElement;
-                    root.setAttribute('data-theme', mode);
-                    if (mode === 'dark') {
-                        root.classList.add('dark');
-                    }
-                }""",
-                theme_mode,
-            )
+            await page.evaluate(_APPLY_THEME_JS, theme_mode)
             await page.wait_for_timeout(500)
         except Exception:
-            self.limits.append(f"Theme mode '{theme_mode}' could not be applied programmatically")
+            if record_limit:
+                self.limits.append(f"Theme mode '{theme_mode}' could not be applied programmatically")
+            return False
+        return True
 
-    async def capture_screenshots(self, page: Page, safe_tag: str) -> None:
+    async def capture_screenshots(self, page: Page, safe_tag: str) -> Path:
         full_path = self.screenshots_dir / f"{safe_tag}_full.png"
         await page.screenshot(path=str(full_path), full_page=True)
         self.evidence_paths["screenshots"].add(str(full_path.relative_to(self.output_dir)))
@@ -721,54 +1416,76 @@ class DesignSystemCollector:
             self.evidence_paths["screenshots"].add(str(navbar_path.relative_to(self.output_dir)))
         except Exception:
             pass
+        return full_path
+
+    async def snapshot_page(self, page: Page, full_path: Path) -> Optional[Dict[str, Any]]:
+        """Decode the full-page screenshot once so candidates and samples can be cropped from it."""
+        if Image is None:
+            return None
+        try:
+            scale = await page.evaluate(_DEVICE_SCALE_JS)
+            image = Image.open(full_path)
+            image.load()
+        except Exception:
+            return None
+        return {"image": image, "scale": scale}
+
+    async def save_crop(
+        self,
+        el,
+        meta: Dict[str, Any],
+        crop_path: Path,
+        snapshot: Optional[Dict[str, Any]],
+    ) -> Optional[str]:
+        try:
+            box = snapshot_box(snapshot, meta) if snapshot else None
+            if box:
+                snapshot["image"].crop(box).save(crop_path, compress_level=1)
+            else:
+                await el.screenshot(path=str(crop_path))
+        except Exception:
+            return None
+        crop_rel = str(crop_path.relative_to(self.output_dir))
+        self.evidence_paths["crops"].add(crop_rel)
+        return crop_rel
 
     async def save_html(self, page: Page, safe_tag: str) -> Path:
-        html_content = await page.evaluate("() => document.documentElement.outerHTML")
-        html_path = self.html_dir / f"{safe_tag}.html"
-        write_text(html_path, html_content)
+        html_content = await page.evaluate(_GET_HTML_JS)
+        html_path, _ = self.write_text_once(self.html_dir / f"{safe_tag}.html", html_content)
         self.evidence_paths["html"].add(str(html_path.relative_to(self.output_dir)))
         return html_path
 
     async def extract_css_urls(self, page: Page) -> List[str]:
-        css_urls = await page.evaluate(
-            """() => {
-                const urls = [];
-                document.querySelectorAll('link[rel="stylesheet"]').forEach(el => urls.push(el.href));
-                document.querySelectorAll('style').forEach(el => {
-                    const matches = el.textContent.match(/@import\\s+url\\(['"]?([^'")]+)['"]?\\)/g);
-                    if (matches) {
-                        matches.forEach(m => {
-                            const url = m.match(/@import\\s+url\\(['"]?([^'")]+)['"]?\\)/)[1];
-                            urls.push(url);
-                        });
-                    }
-                });
-                return Array.from(new Set(urls));
-            }"""
-        )
+        css_urls = await page.evaluate(_EXTRACT_CSS_JS)
         return css_urls
 
     async def download_css(self, page: Page, css_urls: List[str], safe_tag: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]:
         css_data: Dict[str, Any] = {}
         font_faces: List[Dict[str, Any]] = []
         css_texts: List[str] = []
-        seen = set()
 
-        for idx, url in enumerate(css_urls):
-            if url in seen:
-                continue
-            seen.add(url)
+        async def fetch(url: str) -> Tuple[Optional[bytes], Optional[str]]:
             try:
                 response = await page.request.get(url)
-                content = await response.body()
+                return await response.body(), None
+            except Exception as exc:
+                return None, str(exc)
+
+        unique_urls = list(dict.fromkeys(css_urls))
+        fetched = await asyncio.gather(*(fetch(url) for url in unique_urls))
+
+        for idx, (url, (content, error)) in enumerate(zip(unique_urls, fetched)):
+            if content is None:
+                css_data[url] = {"error": error}
+                continue
+            try:
                 try:
                     css_text = content.decode("utf-8")
                 except Exception:
                     css_text = content.decode("latin-1", errors="ignore")
 
                 filename = f"{safe_tag}_{idx}.css"
-                css_path = self.css_dir / filename
-                write_text(css_path, css_text)
+                css_path, digest = self.write_text_once(self.css_dir / filename, css_text)
                 self.evidence_paths["css"].add(str(css_path.relative_to(self.output_dir)))
 
                 css_texts.append(css_text)
@@ -776,7 +1493,7 @@ class DesignSystemCollector:
                     "type": "external",
                     "url": url,
                     "file": str(css_path.relative_to(self.output_dir)),
-                }))
+                }, digest))
 
                 css_data[url] = {
                     "file": str(css_path.relative_to(self.output_dir)),
@@ -788,9 +1505,7 @@ class DesignSystemCollector:
         return css_data, font_faces, css_texts
 
     async def collect_inline_font_faces(self, page: Page, safe_tag: str) -> Tuple[List[Dict[str, Any]], List[str]]:
-        inline_styles = await page.evaluate(
-            """() => Array.from(document.querySelectorAll('style')).map(el => el.textContent || '')"""
-        )
+        inline_styles = await page.evaluate(_GET_INLINE_STYLES_JS)
         font_faces: List[Dict[str, Any]] = []
         css_texts: List[str] = []
         for idx, css_text in enumerate(inline_styles):
@@ -798,26 +1513,25 @@ class DesignSystemCollector:
                 continue
             css_texts.append(css_text)
             inline_name = f"{safe_tag}_inline_{idx}.css"
-            inline_path = self.css_dir / inline_name
-            write_text(inline_path, css_text)
+            inline_path, digest = self.write_text_once(self.css_dir / inline_name, css_text)
             self.evidence_paths["css"].add(str(inline_path.relative_to(self.output_dir)))
             font_faces.extend(self.parse_font_faces(css_text, {
                 "type": "inline",
                 "index": idx,
                 "file": str(inline_path.relative_to(self.output_dir)),
-            }))
+            }, digest))
         return font_faces, css_texts
 
-    def parse_font_faces(self, css_text: str, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def parse_font_faces(
+        self, css_text: str, source: Dict[str, Any], content_key: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        declarations = self._font_face_cache.get(content_key) if content_key else None
+        if declarations is None:
+            declarations = [dict(iter_declarations(block)) for block in iter_at_rule_blocks(css_text, "@font-face")]
+            if content_key:
+                self._font_face_cache[content_key] = declarations
         faces = []
-        for match in re.finditer(r"@font-face\s*{([^}]*)}", css_text, re.IGNORECASE | re.DOTALL):
-            block = match.group(1)
-            props = {}
-            for decl in re.split(r";\s*", block):
-                if not decl.strip() or ":" not in decl:
-                    continue
-                name, value = decl.split(":", 1)
-                props[name.strip().lower()] = value.strip()
+        for props in declarations:
             faces.append({
                 "font_family": props.get("font-family"),
                 "src": props.get("src"),
@@ -829,22 +1543,23 @@ class DesignSystemCollector:
         return faces
 
     def scan_css_keywords(self, css_text: str) -> Dict[str, Any]:
-        keywords = {
-            "tailwind": ["--tw-", "@layer", "ring-", "prose-", "preflight"],
-            "bootstrap": ["--bs-", ".container", ".row", ".col-", ".btn"],
-            "antd": [".ant-", "--ant-"],
-            "mui": [".mui", "css-", "@emotion"],
-            "chakra": ["--chakra-"],
-            "radix": ["data-radix-", "[data-state"],
-        }
+        # Per keyword, only count hits that start past its previous hit, matching
+        # str.count's non-overlapping semantics ("--ant--ant-" is one hit).
+        hits = Counter()
+        ends: Dict[str, int] = {}
+        for match in _CSS_KEYWORD_RE.finditer(css_text.lower()):
+            keyword = match.group(1)
+            start = match.start()
+            if start >= ends.get(keyword, 0):
+                hits[keyword] += 1
+                ends[keyword] = start + len(keyword)
         found = {}
-        lower = css_text.lower()
-        for framework, patterns in keywords.items():
-            matches = [p for p in patterns if p.lower() in lower]
+        for framework, patterns in CSS_KEYWORDS.items():
+            matches = [p for p in patterns if hits[p.lower()]]
             if matches:
                 found[framework] = {
                     "matches": matches,
-                    "count": sum(lower.count(p.lower()) for p in patterns),
+                    "count": sum(hits[p.lower()] for p in patterns),
                 }
         return found
 
@@ -869,116 +1584,67 @@ class DesignSystemCollector:
             ],
         }
 
-        for probe, selectors in probe_selectors.items():
-            selected = None
-            selected_meta = None
-            selector_used = None
-            for selector in selectors:
-                elements = await page.query_selector_all(selector)
-                for el in elements:
-                    meta = await self.element_candidate_info(el, allow_empty_text=True)
-                    if meta:
-                        selected = el
-                        selected_meta = meta
-                        selector_used = selector
-                        break
-                if selected:
-                    break
+        matches = await page.evaluate(
+            _FONT_PROBES_JS,
+            {"selectorMap": probe_selectors, "props": TYPOGRAPHY_PROPS},
+        )
 
-            if not selected or not selected_meta:
+        for probe in probe_selectors:
+            match = matches.get(probe)
+            if not match:
                 continue
-
-            styles = await self.computed_style(selected, TYPOGRAPHY_PROPS)
-            probe_entry = {
+            probes.append({
                 "page": page_key,
                 "probe": probe,
-                "selector_used": selector_used,
-                "text": selected_meta.get("text"),
-                "bbox": selected_meta.get("bbox"),
-                "styles": styles,
-            }
-            probes.append(probe_entry)
+                "selector_used": match.get("selector"),
+                "text": normalize_text(match.get("text", "")),
+                "bbox": match.get("bbox"),
+                "styles": match.get("styles", {}),
+            })
 
         return probes
 
     async def computed_style(self, element, props: List[str]) -> Dict[str, str]:
-        return await element.evaluate(
-            """(el, props) => {
-                const computed = window.getComputedStyle(el);
-                const result = {};
-                props.forEach(p => { result[p] = computed.getPropertyValue(p); });
-                return result;
-            }""",
-            props,
-        )
+        return await element.evaluate(_COMPUTED_STYLE_JS, props)
 
     async def element_candidate_info(self, el, allow_empty_text: bool = False) -> Optional[Dict[str, Any]]:
         try:
-            box = await el.bounding_box()
-            if not box or box["width"] < 24 or box["height"] < 24:
-                return None
-            meta = await el.evaluate(
-                """el => {
-                    const style = window.getComputedStyle(el);
-                    return {
-                        text: (el.textContent || '').trim(),
-                        role: el.getAttribute('role'),
-                        aria_label: el.getAttribute('aria-label'),
-                        display: style.display,
-                        visibility: style.visibility,
-                        opacity: style.opacity,
-                    };
-                }"""
-            )
-            if meta.get("display") == "none" or meta.get("visibility") == "hidden":
-                return None
-            try:
-                opacity_val = float(meta.get("opacity") or "1")
-            except ValueError:
-                opacity_val = 1.0
-            if opacity_val <= 0:
-                return None
-
-            text = normalize_text(meta.get("text", ""))
-            if not allow_empty_text and not text and not meta.get("role") and not meta.get("aria_label"):
-                return None
+            raw = await el.evaluate(_PROBE_ELEMENT_JS, None)
+        except Exception:
+            return None
+        return candidate_meta(raw, allow_empty_text)
 
-            return {
-                "text": text,
-                "role": meta.get("role"),
-                "aria_label": meta.get("aria_label"),
-                "bbox": box,
-            }
+    async def probe_element(
+        self,
+        el,
+        props: List[str],
+        allow_empty_text: bool = False,
+    ) -> Optional[Tuple[Dict[str, Any], str, Dict[str, str]]]:
+        try:
+            raw = await el.evaluate(_PROBE_ELEMENT_JS, props)
         except Exception:
             return None
+        meta = candidate_meta(raw, allow_empty_text)
+        if not meta:
+            return None
+        return meta, raw["selector_path"], raw["computed"]
 
-    async def build_selector_path(self, el) -> str:
-        return await el.evaluate(
-            """(el) => {
-                if (el.id) {
-                    return '#' + CSS.escape(el.id);
-                }
-                const parts = [];
-                let node = el;
-                let depth = 0;
-                while (node && node.nodeType === 1 && depth < 5) {
-                    let selector = node.tagName.toLowerCase();
-                    const classes = (node.className || '').toString().trim().split(/\\s+/).filter(Boolean);
-                    if (classes.length) {
-                        selector += '.' + classes.slice(0, 2).map(c => CSS.escape(c)).join('.');
-                    }
-                    const siblings = node.parentElement ? Array.from(node.parentElement.children).filter(n => n.tagName === node.tagName) : [];
-                    if (siblings.length > 1) {
-                        const index = siblings.indexOf(node) + 1;
-                        selector += `:nth-of-type(${index})`;
-                    }
-                    parts.unshift(selector);
-                    node = node.parentElement;
-                    depth += 1;
-                }
-                return parts.join(' > ');
-            }"""
-        )
+    async def query_selector_group(self, page: Page, selectors: List[str]) -> List[Tuple[str, Any]]:
+        handle = await page.evaluate_handle(_QUERY_GROUP_JS, selectors)
+        try:
+            properties = await handle.get_properties()
+            index_handle = properties.pop("selectorIndex")
+            try:
+                selector_index = await index_handle.json_value()
+            finally:
+                await index_handle.dispose()
+            elements = [
+                properties[key].as_element()
+                for key in sorted((k for k in properties if k.isdigit()), key=int)
+            ]
+        finally:
+            await handle.dispose()
+        return [(selectors[i], el) for i, el in zip(selector_index, elements) if el]
 
     def score_candidate(self, meta: Dict[str, Any], computed: Dict[str, Any], group: str, viewport_height: int) -> float:
         score = 0.0
@@ -996,7 +1662,7 @@ class DesignSystemCollector:
             score += 2.0
         if group in {"nav"}:
             score += 1.0
-        if any(k in text for k in ["get started", "start", "free", "trial", "sign up", "register"]):
+        if any(k in text for k in _CTA_KEYWORDS):
             score += 3.0
 
         if area >= 20000:
@@ -1004,16 +1670,13 @@ class DesignSystemCollector:
         if bbox.get("y", 0) < viewport_height:
             score += 1.0
 
-        font_weight = computed.get("font-weight", "").strip()
-        try:
-            if int(float(font_weight)) >= 700:
-                score += 1.0
-        except Exception:
-            pass
+        font_weight = parse_font_weight(computed.get("font-weight", ""))
+        if font_weight is not None and font_weight >= 700:
+            score += 1.0
 
         bg = (computed.get("background-color") or "").lower()
         bg_img = (computed.get("background-image") or "").lower()
-        if bg and bg not in {"rgba(0, 0, 0, 0)", "transparent"}:
+        if bg and bg not in _TRANSPARENT_BACKGROUNDS:
             score += 0.5
         if bg_img and bg_img != "none":
             score += 1.0
@@ -1027,6 +1690,7 @@ class DesignSystemCollector:
         breakpoint: str,
         theme_mode: str,
         safe_tag: str,
+        snapshot: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         selector_groups = {
             "cta": [".hero__cta a", ".btn.btn-primary", ".btn-primary", "a.btn", "button"],
@@ -1048,54 +1712,46 @@ class DesignSystemCollector:
         for group, selectors in selector_groups.items():
             collected = 0
             allow_empty = group in {"media"}
-            for selector in selectors:
+
+            async def probe(match):
+                return await self.probe_element(match[1], CANDIDATE_PROPS, allow_empty_text=allow_empty)
+
+            matches = await self.query_selector_group(page, selectors)
+            async for (selector, el), probed in iter_probed(matches, probe):
                 if collected >= max_per_group:
                     break
-                elements = await page.query_selector_all(selector)
-                for el in elements:
-                    if collected >= max_per_group:
-                        break
-                    meta = await self.element_candidate_info(el, allow_empty_text=allow_empty)
-                    if not meta:
-                        continue
-
-                    selector_path = await self.build_selector_path(el)
-                    dedupe_key = (group, meta.get("text"), round(meta["bbox"]["width"], 1), round(meta["bbox"]["height"], 1))
-                    if dedupe_key in seen_keys:
-                        continue
-                    seen_keys.add(dedupe_key)
-
-                    computed = await self.computed_style(el, CANDIDATE_PROPS)
-                    score = self.score_candidate(meta, computed, group, viewport_height)
-
-                    crop_name = f"{safe_tag}_candidate_{group}_{collected}.png"
-                    crop_path = self.crops_dir / crop_name
-                    crop_rel = None
-                    try:
-                        await el.screenshot(path=str(crop_path))
-                        crop_rel = str(crop_path.relative_to(self.output_dir))
-                        self.evidence_paths["crops"].add(crop_rel)
-                    except Exception:
-                        crop_rel = None
-
-                    candidate_id = f"{safe_tag}_candidate_{group}_{collected}"
-                    candidates.append({
-                        "id": candidate_id,
-                        "group": group,
-                        "page": page_name,
-                        "breakpoint": breakpoint,
-                        "theme": theme_mode,
-                        "selector": selector,
-                        "selector_path": selector_path,
-                        "text": meta.get("text"),
-                        "role": meta.get("role"),
-                        "aria_label": meta.get("aria_label"),
-                        "bbox": meta.get("bbox"),
-                        "crop_path": crop_rel,
-                        "computed": computed,
-                        "score": round(score, 2),
-                    })
-                    collected += 1
+                if not probed:
+                    continue
+                meta, selector_path, computed = probed
+
+                dedupe_key = (group, meta.get("text"), round(meta["bbox"]["width"] * 10), round(meta["bbox"]["height"] * 10))
+                if dedupe_key in seen_keys:
+                    continue
+                seen_keys.add(dedupe_key)
+
+                score = self.score_candidate(meta, computed, group, viewport_height)
+
+                crop_path = self.crops_dir / f"{safe_tag}_candidate_{group}_{collected}.png"
+                crop_rel = await self.save_crop(el, meta, crop_path, snapshot)
+
+                candidate_id = f"{safe_tag}_candidate_{group}_{collected}"
+                candidates.append({
+                    "id": candidate_id,
+                    "group": group,
+                    "page": page_name,
+                    "breakpoint": breakpoint,
+                    "theme": theme_mode,
+                    "selector": selector,
+                    "selector_path": selector_path,
+                    "text": meta.get("text"),
+                    "role": meta.get("role"),
+                    "aria_label": meta.get("aria_label"),
+                    "bbox": meta.get("bbox"),
+                    "crop_path": crop_rel,
+                    "computed": computed,
+                    "score": round(score, 2),
+                })
+                collected += 1
 
         return candidates
 
@@ -1106,6 +1762,7 @@ class DesignSystemCollector:
         breakpoint: str,
         theme_mode: str,
         safe_tag: str,
+        snapshot: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         selector_groups = {
             "typography": ["h1", "h2", "p", "small", "label"],
@@ -1134,71 +1791,57 @@ class DesignSystemCollector:
         seen_keys = set()
         max_per_group = 6
 
+        async def probe(match):
+            return await self.probe_element(match[1], ALL_PROPS)
+
         for component_type, selectors in selector_groups.items():
             collected = 0
-            for selector in selectors:
+            matches = await self.query_selector_group(page, selectors)
+            async for (selector, el), probed in iter_probed(matches, probe):
                 if collected >= max_per_group:
                     break
-                elements = await page.query_selector_all(selector)
-                for el in elements:
-                    if collected >= max_per_group:
-                        break
-                    meta = await self.element_candidate_info(el)
-                    if not meta:
-                        continue
-                    if component_type == "chip":
-                        if not await self.is_chip_like(el, meta):
-                            continue
-
-                    selector_path = await self.build_selector_path(el)
-                    dedupe_key = (component_type, meta.get("text"), round(meta["bbox"]["width"], 1), round(meta["bbox"]["height"], 1))
-                    if dedupe_key in seen_keys:
-                        continue
-                    seen_keys.add(dedupe_key)
-
-                    computed = await self.computed_style(el, ALL_PROPS)
-                    crop_name = f"{safe_tag}_{component_type}_{collected}.png"
-                    crop_path = self.crops_dir / crop_name
-                    crop_rel = None
-                    try:
-                        await el.screenshot(path=str(crop_path))
-                        crop_rel = str(crop_path.relative_to(self.output_dir))
-                        self.evidence_paths["crops"].add(crop_rel)
-                    except Exception:
-                        crop_rel = None
-
-                    sample_id = f"{safe_tag}_{component_type}_{collected}"
-                    sample = {
-                        "id": sample_id,
-                        "component_type": component_type,
-                        "page": page_name,
-                        "breakpoint": breakpoint,
-                        "theme": theme_mode,
-                        "selector": selector,
-                        "selector_path": selector_path,
-                        "role": meta.get("role"),
-                        "aria_label": meta.get("aria_label"),
-                        "text": meta.get("text"),
-                        "bbox": meta.get("bbox"),
-                        "crop_path": crop_rel,
-                        "computed": computed,
-                        "states": {},
-                        "diffs": {},
-                    }
-                    samples.append(sample)
-                    collected += 1
+                if not probed:
+                    continue
+                meta, selector_path, computed = probed
+                if component_type == "chip" and not self.is_chip_like(meta, computed):
+                    continue
+
+                dedupe_key = (component_type, meta.get("text"), round(meta["bbox"]["width"] * 10), round(meta["bbox"]["height"] * 10))
+                if dedupe_key in seen_keys:
+                    continue
+                seen_keys.add(dedupe_key)
+
+                crop_path = self.crops_dir / f"{safe_tag}_{component_type}_{collected}.png"
+                crop_rel = await self.save_crop(el, meta, crop_path, snapshot)
+
+                sample_id = f"{safe_tag}_{component_type}_{collected}"
+                sample = {
+                    "id": sample_id,
+                    "component_type": component_type,
+                    "page": page_name,
+                    "breakpoint": breakpoint,
+                    "theme": theme_mode,
+                    "selector": selector,
+                    "selector_path": selector_path,
+                    "role": meta.get("role"),
+                    "aria_label": meta.get("aria_label"),
+                    "text": meta.get("text"),
+                    "bbox": meta.get("bbox"),
+                    "crop_path": crop_rel,
+                    "computed": computed,
+                    "states": {},
+                    "diffs": {},
+                }
+                samples.append(sample)
+                collected += 1
 
         return samples
 
-    async def is_chip_like(self, el, meta: Dict[str, Any]) -> bool:
-        try:
-            styles = await self.computed_style(el, ["border-radius", "height", "display"])
-            height = parse_length(styles.get("height", "")) or meta["bbox"]["height"]
-            radius = parse_length(styles.get("border-radius", "")) or 0
-            display = (styles.get("display") or "").lower()
-            return height <= 40 and radius >= height / 2 and "inline" in display
-        except Exception:
-            return False
+    def is_chip_like(self, meta: Dict[str, Any], computed: Dict[str, str]) -> bool:
+        height = parse_length(computed.get("height") or "") or meta["bbox"]["height"]
+        radius = parse_length(computed.get("border-radius") or "") or 0
+        display = (computed.get("display") or "").lower()
+        return height <= 40 and radius >= height / 2 and "inline" in display
 
     async def collect_overlay_samples(
         self,
@@ -1213,8 +1856,9 @@ class DesignSystemCollector:
             "[aria-haspopup], [aria-expanded], [data-state], button, [role='button']"
         )
         trigger_candidates = []
-        for el in triggers:
-            meta = await self.element_candidate_info(el, allow_empty_text=True)
+        async for el, meta in iter_probed(
+            triggers, lambda el: self.element_candidate_info(el, allow_empty_text=True)
+        ):
             if not meta:
                 continue
             text = (meta.get("text") or "").lower()
@@ -1235,33 +1879,26 @@ class DesignSystemCollector:
                     continue
 
             await page.wait_for_timeout(500)
+            await page.evaluate(_RESET_PROBE_CACHE_JS)
             panels = await page.query_selector_all(
                 "[role='dialog'], [role='menu'], [role='listbox'], [role='tooltip'], [data-state='open']"
             )
             panel = None
-            panel_meta = None
-            for candidate in panels:
-                meta = await self.element_candidate_info(candidate, allow_empty_text=True)
-                if meta:
+            probed = None
+            async for candidate, probed in iter_probed(
+                panels, lambda el: self.probe_element(el, ALL_PROPS, allow_empty_text=True)
+            ):
+                if probed:
                     panel = candidate
-                    panel_meta = meta
                     break
 
-            if not panel or not panel_meta:
+            if not panel or not probed:
                 self.limits.append("Overlay panel not detected after trigger")
                 continue
 
-            selector_path = await self.build_selector_path(panel)
-            computed = await self.computed_style(panel, ALL_PROPS)
-            crop_name = f"{safe_tag}_overlay_panel_{idx}.png"
-            crop_path = self.crops_dir / crop_name
-            crop_rel = None
-            try:
-                await panel.screenshot(path=str(crop_path))
-                crop_rel = str(crop_path.relative_to(self.output_dir))
-                self.evidence_paths["crops"].add(crop_rel)
-            except Exception:
-                pass
+            panel_meta, selector_path, computed = probed
+            crop_path = self.crops_dir / f"{safe_tag}_overlay_panel_{idx}.png"
+            crop_rel = await self.save_crop(panel, panel_meta, crop_path, None)
 
             samples.append({
                 "id": f"{safe_tag}_overlay_panel_{idx}",
@@ -1281,69 +1918,97 @@ class DesignSystemCollector:
                 "diffs": {},
             })
 
-    async def collect_states(self, page: Page, samples: List[Dict[str, Any]]) -> None:
-        base_url = page.url
+    async def collect_states(
+        self,
+        page: Page,
+        samples: List[Dict[str, Any]],
+        context: Optional[BrowserContext] = None,
+        url: str = "",
+        theme_mode: str = "default",
+    ) -> None:
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
         for sample in samples:
-            if sample["component_type"] not in {"button", "nav_link", "input", "chip", "card"}:
-                continue
-            selector_path = sample.get("selector_path")
-            if not selector_path:
-                continue
+            if sample["component_type"] in {"button", "nav_link", "input", "chip", "card"} and sample.get("selector_path"):
+                queue.put_nowait(sample)
+        if queue.empty():
+            return
+
+        async def worker(worker_page: Page) -> None:
+            base_url = worker_page.url
+            while not queue.empty():
+                await self.collect_sample_states(worker_page, queue.get_nowait(), base_url)
+
+        async def extra_worker() -> None:
+            # Extra tabs are only opened once there is work; the main page
+            # starts draining the queue while they load.
+            extra_page = await self.open_state_page(context, url, theme_mode)
+            if extra_page is None:
+                return
             try:
-                el = await page.query_selector(selector_path)
-                if not el:
-                    el = await self.find_element_by_text_role(page, sample)
-                if not el:
-                    sample["diffs"] = {"error": "element_not_found"}
-                    continue
+                await worker(extra_page)
+            finally:
+                await extra_page.close()
 
-                try:
-                    await el.scroll_into_view_if_needed()
-                except Exception:
-                    pass
-
-                default_styles = await self.computed_style(el, STATE_DIFF_PROPS)
-                sample["states"]["default"] = default_styles
-
-                is_navigational = await el.evaluate(
-                    """el => {
-                        const tag = (el.tagName || '').toLowerCase();
-                        if (tag === 'a') return true;
-                        if (el.getAttribute('role') === 'link') return true;
-                        if (el.closest('a')) return true;
-                        const href = el.getAttribute('href');
-                        if (href && href !== '#' && href !== 'javascript:void(0)') return true;
-                        return false;
-                    }"""
-                )
+        extra = min(self.state_workers, queue.qsize()) - 1 if context is not None else 0
+        await asyncio.gather(worker(page), *(extra_worker() for _ in range(extra)))
 
-                hover_styles, hover_reason = await self.try_hover(el)
-                focus_styles, focus_reason = await self.try_focus_visible(page, el)
-                if is_navigational and not self.allow_anchor_active:
-                    active_styles, active_reason = {"error": "active skipped for navigational element"}, "skipped navigational element"
-                else:
-                    active_styles, active_reason = await self.try_active(page, el)
-
-                states = {
-                    "hover": hover_styles,
-                    "focus_visible": focus_styles,
-                    "active": active_styles,
-                }
+    async def collect_sample_states(self, page: Page, sample: Dict[str, Any], base_url: str) -> None:
+        selector_path = sample["selector_path"]
+        try:
+            el = await page.query_selector(selector_path)
+            if not el:
+                el = await self.find_element_by_text_role(page, sample)
+            if not el:
+                sample["diffs"] = {"error": "element_not_found"}
+                return
 
-                sample["states"].update(states)
-                sample["diffs"] = {
-                    "hover": self.compute_state_diff(default_styles, hover_styles, hover_reason),
-                    "focus_visible": self.compute_state_diff(default_styles, focus_styles, focus_reason),
-                    "active": self.compute_state_diff(default_styles, active_styles, active_reason),
-                }
-            except Exception as exc:
-                sample["diffs"] = {"error": str(exc)}
-                try:
-                    if page.url != base_url:
-                        await page.goto(base_url, wait_until="domcontentloaded", timeout=30000)
-                        await page.wait_for_timeout(1500)
-                except Exception:
-                    pass
+            try:
+                await el.scroll_into_view_if_needed()
+            except Exception:
+                pass
+
+            default_styles = await self.computed_style(el, STATE_DIFF_PROPS)
+            sample["states"]["default"] = default_styles
+
+            is_navigational = await el.evaluate(
+                """el => {
+                    const tag = (el.tagName || '').toLowerCase();
+                    if (tag === 'a') return true;
+                    if (el.getAttribute('role') === 'link') return true;
+                    if (el.closest('a')) return true;
+                    const href = el.getAttribute('href');
+                    if (href && href !== '#' && href !== 'javascript:void(0)') return true;
+                    return false;
+                }"""
+            )
+
+            hover_styles, hover_reason = await self.try_hover(el)
+            focus_styles, focus_reason = await self.try_focus_visible(page, el)
+            if is_navigational and not self.allow_anchor_active:
+                active_styles, active_reason = {"error": "active skipped for navigational element"}, "skipped navigational element"
+            else:
+                active_styles, active_reason = await self.try_active(page, el)
+
+            states = {
+                "hover": hover_styles,
+                "focus_visible": focus_styles,
+                "active": active_styles,
+            }
+
+            sample["states"].update(states)
+            sample["diffs"] = {
+                "hover": self.compute_state_diff(default_styles, hover_styles, hover_reason),
+                "focus_visible": self.compute_state_diff(default_styles, focus_styles, focus_reason),
+                "active": self.compute_state_diff(default_styles, active_styles, active_reason),
+            }
+        except Exception as exc:
+            sample["diffs"] = {"error": str(exc)}
+            try:
+                if page.url != base_url:
+                    await page.goto(base_url, wait_until="domcontentloaded", timeout=30000)
+                    await page.wait_for_timeout(1500)
+            except Exception:
+                pass
 
     async def try_hover(self, el) -> Tuple[Dict[str, Any], str]:
         try:
@@ -1393,19 +2058,19 @@ class DesignSystemCollector:
         role = sample.get("role")
         if not text and not role:
             return None
-        handle = await page.evaluate_handle(
-            """({text, role}) => {
-                const candidates = Array.from(document.querySelectorAll('*'));
-                for (const el of candidates) {
-                    const matchesRole = role ? el.getAttribute('role') === role : true;
-                    const matchesText = text ? (el.textContent || '').trim().includes(text) : true;
-                    if (matchesRole && matchesText) return el;
-                }
-                return null;
-            }""",
-            {"text": text, "role": role},
-        )
-        return handle.as_element() if handle else None
+        if role:
+            escaped_role = role.replace("\\", "\\\\").replace('"', '\\"')
+            role_selector = f'[role="{escaped_role}"]'
+            locator = page.locator(role_selector, has_text=text) if text else page.locator(role_selector)
+        else:
+            locator = page.get_by_text(text)
+        try:
+            # element_handle() waits for a match; return at once when there is none.
+            if not await locator.count():
+                return None
+            return await locator.first.element_handle(timeout=2000)
+        except Exception:
+            return None
 
     async def collect_tech_fingerprint(self, page: Page, css_data: Dict[str, Any]) -> Dict[str, Any]:
         fingerprint = {
@@ -1436,12 +2101,11 @@ class DesignSystemCollector:
         elif runtime_checks.get("astro"):
             fingerprint["framework"] = {"name": "Astro", "confidence": "Likely", "evidence": ["html[data-astro]"]}
 
-        keyword_hits = defaultdict(int)
-        for url, meta in css_data.items():
-            for lib, info in (meta.get("keywords") or {}).items():
-                keyword_hits[lib] += info.get("count", 0)
+        keyword_hits = Counter()
+        for meta in css_data.values():
+            keyword_hits.update({lib: info.get("count", 0) for lib, info in (meta.get("keywords") or {}).items()})
         if keyword_hits:
-            top = max(keyword_hits.items(), key=lambda x: x[1])
+            top = keyword_hits.most_common(1)[0]
             if top[0] == "tailwind":
                 fingerprint["styling"] = {"name": "Tailwind", "confidence": "Likely", "evidence": ["CSS keyword hits"]}
             else:
@@ -1467,8 +2131,7 @@ class DesignSystemCollector:
         return fingerprint
 
     def build_results(self, font_request_path: Path) -> Dict[str, Any]:
-        template_path = self.templates_dir / "results.json"
-        results = json.loads(read_text(template_path))
+        results = copy.deepcopy(self._results_template)
 
         results["meta"] = {
             "site_name": extract_site_name(self.base_url),
@@ -1482,19 +2145,11 @@ class DesignSystemCollector:
             },
         }
 
-        results["evidence"] = {
-            "screenshots": sorted(self.evidence_paths["screenshots"]),
-            "crops": sorted(self.evidence_paths["crops"]),
-            "html": sorted(self.evidence_paths["html"]),
-            "css": sorted(self.evidence_paths["css"]),
-            "fonts": sorted(self.evidence_paths["fonts"]),
-            "samples": sorted(self.evidence_paths["samples"]),
-            "network": sorted(self.evidence_paths["network"]),
-        }
+        results["evidence"] = {kind: sorted(paths) for kind, paths in self.evidence_paths.items()}
 
         results["tech_stack"] = self.tech_stack or results.get("tech_stack", {})
 
-        font_requests = json.loads(read_text(font_request_path)).get("items", [])
+        font_requests = read_json(font_request_path).get("items", [])
         font_conclusion = self.build_font_conclusion(font_requests)
         results["font_forensics"] = {
             "verified_status": font_conclusion.get("status"),
@@ -1524,24 +2179,22 @@ class DesignSystemCollector:
         return results
 
     def build_font_conclusion(self, font_requests: List[Dict[str, Any]]) -> Dict[str, Any]:
-        families = []
-        from_faces = [f.get("font_family") for f in self.font_faces if f.get("font_family")]
-        for fam in from_faces:
-            fam = fam.replace('"', "").replace("'", "")
-            families.append(fam)
-        primary = sorted(set(families))
-
-        computed_families = []
-        for probe in self.font_probes:
-            styles = probe.get("styles", {})
-            fam = styles.get("font-family", "")
-            if fam:
-                computed_families.append(fam)
+        primary = sorted({
+            f["font_family"].translate(_QUOTE_STRIP)
+            for f in self.font_faces
+            if f.get("font_family")
+        })
+        primary_lower = {fam.lower() for fam in primary}
+
+        computed_families = [
+            fam for fam in (probe.get("styles", {}).get("font-family", "") for probe in self.font_probes) if fam
+        ]
 
         verified = False
-        for fam in computed_families:
-            first = fam.split(",")[0].strip().strip("\"").lower()
-            if first and first not in SYSTEM_FONTS and any(first in f.lower() for f in primary):
+        for first in {fam.split(",")[0].strip().strip("\"").lower() for fam in computed_families}:
+            if not first or first in SYSTEM_FONTS:
+                continue
+            if first in primary_lower or any(first in fam for fam in primary_lower):
                 verified = True
                 break
         if not verified and font_requests and computed_families:
@@ -1558,160 +2211,98 @@ class DesignSystemCollector:
         }
 
     def cluster_tokens(self) -> Dict[str, Any]:
-        primitive = json.loads(read_text(self.templates_dir / "results.json")).get("tokens", {}).get("primitive", {})
-        semantic = json.loads(read_text(self.templates_dir / "results.json")).get("tokens", {}).get("semantic", {})
-        component = json.loads(read_text(self.templates_dir / "results.json")).get("tokens", {}).get("component", {})
+        tokens = copy.deepcopy(self._results_template.get("tokens", {}))
+        primitive = tokens.get("primitive", {})
+        semantic = tokens.get("semantic", {})
+        component = tokens.get("component", {})
+
+        counts = self._token_counts
 
+        # Classify each distinct color string once, weighted by its count.
+        # Counters keep first-seen order, so tie order matches per-sample counting.
         color_neutrals = Counter()
         color_accents = Counter()
         color_opacity = Counter()
-
-        font_sizes = Counter()
-        line_heights = Counter()
-        letter_spacing = Counter()
-        font_weights = Counter()
-
-        spacing_values = Counter()
-        radius_values = Counter()
-        border_values = Counter()
-        shadow_values = Counter()
-        motion_durations = Counter()
-        motion_easings = Counter()
-        motion_properties = Counter()
-        z_index_values = Counter()
-
-        for sample in self.samples:
-            computed = sample.get("computed", {})
-            if not computed:
+        color_table = self.color_table()
+        for raw, count in self._raw_colors.items():
+            color = color_table[raw]
+            if not color:
                 continue
-
-            fg = parse_color(computed.get("color", ""))
-            bg = parse_color(computed.get("background-color", ""))
-            border = parse_color(computed.get("border-color", ""))
-            outline = parse_color(computed.get("outline-color", ""))
-
-            for color in [fg, bg, border, outline]:
-                if not color:
-                    continue
-                color_str = color_to_string(color)
-                if color_is_neutral(color):
-                    color_neutrals[color_str] += 1
-                else:
-                    color_accents[color_str] += 1
-                if color[3] < 1:
-                    color_opacity[str(round(color[3], 3))] += 1
-
-            for key, counter in [
-                ("font-size", font_sizes),
-                ("line-height", line_heights),
-                ("letter-spacing", letter_spacing),
-                ("font-weight", font_weights),
-            ]:
-                val = computed.get(key, "")
-                if not val:
-                    continue
-                counter[val.strip()] += 1
-
-            for key in [
-                "padding-top",
-                "padding-right",
-                "padding-bottom",
-                "padding-left",
-                "margin-top",
-                "margin-right",
-                "margin-bottom",
-                "margin-left",
-                "gap",
-            ]:
-                val = computed.get(key, "")
-                if val and val not in {"0px", "0"}:
-                    spacing_values[val.strip()] += 1
-
-            radius = computed.get("border-radius")
-            if radius and radius != "0px":
-                radius_values[radius.strip()] += 1
-
-            border_w = computed.get("border-width")
-            if border_w and border_w != "0px":
-                border_values[border_w.strip()] += 1
-
-            shadow = computed.get("box-shadow")
-            if shadow and shadow != "none":
-                shadow_values[shadow.strip()] += 1
-
-            duration = computed.get("transition-duration")
-            if duration and duration != "0s":
-                motion_durations[duration.strip()] += 1
-            easing = computed.get("transition-timing-function")
-            if easing and easing != "ease":
-                motion_easings[easing.strip()] += 1
-            props = computed.get("transition-property")
-            if props and props != "all":
-                for prop in props.split(","):
-                    prop = prop.strip()
-                    if prop:
-                        motion_properties[prop] += 1
-
-            z_index = computed.get("z-index")
-            if z_index and z_index not in {"auto", "0"}:
-                z_index_values[z_index.strip()] += 1
-
-        neutral_top, neutral_outliers = self.split_counter(color_neutrals)
-        accent_top, accent_outliers = self.split_counter(color_accents)
+            if color_is_neutral(color):
+                color_neutrals[color] += count
+            else:
+                color_accents[color] += count
+            if color[3] < 1:
+                # Bucket by thousandths; round(a, 3) first keeps ties identical to
+                # the emitted str(round(a, 3)) form.
+                color_opacity[round(round(color[3], 3) * 1000)] += count
+        color_opacity = Counter({str(k / 1000): c for k, c in color_opacity.items()})
+
+        neutral_top, neutral_outliers = self.split_counter(color_neutrals, fmt=color_to_string)
+        accent_top, accent_outliers = self.split_counter(color_accents, fmt=color_to_string)
         opacity_top, opacity_outliers = self.split_counter(color_opacity)
         primitive["color"]["neutrals"] = neutral_top
         primitive["color"]["accents"] = accent_top
         primitive["color"]["opacity"] = opacity_top
-        primitive["color"]["outliers"] = neutral_outliers + accent_outliers + opacity_outliers
+        primitive["color"]["outliers"] = list(chain(neutral_outliers, accent_outliers, opacity_outliers))
 
-        font_scale_top, font_scale_outliers = self.split_counter(font_sizes)
-        line_height_top, line_height_outliers = self.split_counter(line_heights)
-        letter_spacing_top, letter_spacing_outliers = self.split_counter(letter_spacing)
-        font_weight_top, font_weight_outliers = self.split_counter(font_weights)
+        font_scale_top, font_scale_outliers = self.split_counter(counts["font_sizes"])
+        line_height_top, line_height_outliers = self.split_counter(counts["line_heights"])
+        letter_spacing_top, letter_spacing_outliers = self.split_counter(counts["letter_spacing"])
+        font_weight_top, font_weight_outliers = self.split_counter(counts["font_weights"])
         primitive["typography"]["scale"] = font_scale_top
         primitive["typography"]["line_heights"] = line_height_top
         primitive["typography"]["letter_spacing"] = letter_spacing_top
         primitive["typography"]["weights"] = font_weight_top
-        primitive["typography"]["outliers"] = (
-            font_scale_outliers
-            + line_height_outliers
-            + letter_spacing_outliers
-            + font_weight_outliers
-        )
-
-        spacing_top, spacing_outliers = self.split_counter(spacing_values)
+        primitive["typography"]["outliers"] = list(chain(
+            font_scale_outliers,
+            line_height_outliers,
+            letter_spacing_outliers,
+            font_weight_outliers,
+        ))
+
+        spacing_top, spacing_outliers = self.split_counter(counts["spacing"])
         primitive["spacing"]["scale"] = spacing_top
         primitive["spacing"]["outliers"] = spacing_outliers
 
-        radius_top, radius_outliers = self.split_counter(radius_values)
+        radius_top, radius_outliers = self.split_counter(counts["radius"])
         primitive["radius"]["scale"] = radius_top
         primitive["radius"]["outliers"] = radius_outliers
 
-        border_top, border_outliers = self.split_counter(border_values)
+        border_top, border_outliers = self.split_counter(counts["border_width"])
         primitive["border_width"]["scale"] = border_top
         primitive["border_width"]["outliers"] = border_outliers
 
-        shadow_top, shadow_outliers = self.split_counter(shadow_values)
+        shadow_top, shadow_outliers = self.split_counter(counts["shadow"])
         primitive["shadow"]["scale"] = shadow_top
         primitive["shadow"]["outliers"] = shadow_outliers
 
-        duration_top, duration_outliers = self.split_counter(motion_durations)
-        easing_top, easing_outliers = self.split_counter(motion_easings)
-        properties_top, properties_outliers = self.split_counter(motion_properties)
+        duration_top, duration_outliers = self.split_counter(counts["motion_durations"])
+        easing_top, easing_outliers = self.split_counter(counts["motion_easings"])
+        properties_top, properties_outliers = self.split_counter(counts["motion_properties"])
         primitive["motion"]["durations"] = duration_top
         primitive["motion"]["easings"] = easing_top
         primitive["motion"]["properties"] = properties_top
-        primitive["motion"]["outliers"] = duration_outliers + easing_outliers + properties_outliers
+        primitive["motion"]["outliers"] = list(
+            chain(duration_outliers, easing_outliers, properties_outliers)
+        )
 
-        z_top, z_outliers = self.split_counter(z_index_values)
+        z_top, z_outliers = self.split_counter(counts["z_index"])
         primitive["z_index"]["scale"] = z_top
         primitive["z_index"]["outliers"] = z_outliers
 
         return {"primitive": primitive, "semantic": semantic, "component": component}
 
     def split_counter(
-        self, counter: Counter, top_n: int = 12
+        self, counter: Counter, top_n: int = 12, fmt: Optional[Callable[[Any], str]] = None
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        if fmt is not None:
+            # Keys that format to the same string are one token; merging in
+            # first-seen order keeps most_common() tie order stable.
+            formatted = Counter()
+            for key, count in counter.items():
+                formatted[fmt(key)] += count
+            counter = formatted
         items = counter.most_common()
         top = [{"value": v, "count": c} for v, c in items[:top_n]]
         outliers = [{"value": v, "count": c} for v, c in items[top_n:]]
@@ -1731,9 +2322,11 @@ class DesignSystemCollector:
             states = sample.get("states", {})
             if not states:
                 continue
+            component = sample.get("component_type")
+            sample_id = sample.get("id")
             entry = {
-                "component": sample.get("component_type"),
-                "id": sample.get("id"),
+                "component": component,
+                "id": sample_id,
                 "states": list(states.keys()),
             }
             state_matrix.append(entry)
@@ -1743,8 +2336,8 @@ class DesignSystemCollector:
                 if not diff:
                     continue
                 state_diffs.append({
-                    "component": sample.get("component_type"),
-                    "id": sample.get("id"),
+                    "component": component,
+                    "id": sample_id,
                     "state": state_name,
                     "changed": diff.get("changed", {}),
                     "reason": diff.get("reason", ""),
@@ -1762,12 +2355,16 @@ class DesignSystemCollector:
         list_row_heights = []
         section_spacing = []
 
+        # Walk samples in collection order: control_heights keys are ordered by
+        # the first sized sample of each type, which the report preserves.
         for sample in self.samples:
-            bbox = sample.get("bbox") or {}
-            height = bbox.get("height")
-            if sample.get("component_type") in {"button", "input", "chip"} and height:
-                controls[sample["component_type"]].append(height)
-            if sample.get("component_type") == "card" and height:
+            height = (sample.get("bbox") or {}).get("height")
+            if not height:
+                continue
+            component_type = sample.get("component_type")
+            if component_type in _CONTROL_TYPES:
+                controls[component_type].append(height)
+            elif component_type == "card":
                 card_paddings.append(height)
 
         density = {
@@ -1784,10 +2381,14 @@ class DesignSystemCollector:
         if not values:
             return {}
         values_sorted = sorted(values)
+        if len(values_sorted) >= 4:
+            p25, _, p75 = statistics.quantiles(values_sorted, n=4)
+        else:
+            p25, p75 = values_sorted[0], values_sorted[-1]
         return {
             "median": statistics.median(values_sorted),
-            "p25": statistics.quantiles(values_sorted, n=4)[0] if len(values_sorted) >= 4 else values_sorted[0],
-            "p75": statistics.quantiles(values_sorted, n=4)[2] if len(values_sorted) >= 4 else values_sorted[-1],
+            "p25": p25,
+            "p75": p75,
             "count": len(values_sorted),
         }
 
@@ -1797,36 +2398,35 @@ class DesignSystemCollector:
         grid_rules = []
         min_card_width = {}
 
-        for sample in self.samples:
-            if sample.get("component_type") == "container":
-                computed = sample.get("computed", {})
-                entry = {
-                    "breakpoint": sample.get("breakpoint"),
-                    "width": computed.get("width"),
-                    "max_width": computed.get("max-width"),
-                    "padding_left": computed.get("padding-left"),
-                    "padding_right": computed.get("padding-right"),
-                }
-                container_steps.append(entry)
-                bp = sample.get("breakpoint")
-                if bp:
-                    gutters.setdefault(bp, []).append({
-                        "left": computed.get("padding-left"),
-                        "right": computed.get("padding-right"),
-                    })
-            if sample.get("component_type") == "grid_container":
-                computed = sample.get("computed", {})
-                grid_rules.append({
-                    "display": computed.get("display"),
-                    "grid_template": computed.get("grid-template-columns"),
-                    "gap": computed.get("gap"),
-                    "breakpoint": sample.get("breakpoint"),
+        for sample in self._by_type.get("container", ()):
+            computed = sample.get("computed", {})
+            entry = {
+                "breakpoint": sample.get("breakpoint"),
+                "width": computed.get("width"),
+                "max_width": computed.get("max-width"),
+                "padding_left": computed.get("padding-left"),
+                "padding_right": computed.get("padding-right"),
+            }
+            container_steps.append(entry)
+            bp = sample.get("breakpoint")
+            if bp:
+                gutters.setdefault(bp, []).append({
+                    "left": computed.get("padding-left"),
+                    "right": computed.get("padding-right"),
                 })
-            if sample.get("component_type") == "card":
-                bbox = sample.get("bbox") or {}
-                width = bbox.get("width")
-                if width:
-                    min_card_width.setdefault(sample.get("breakpoint"), []).append(width)
+        for sample in self._by_type.get("grid_container", ()):
+            computed = sample.get("computed", {})
+            grid_rules.append({
+                "display": computed.get("display"),
+                "grid_template": computed.get("grid-template-columns"),
+                "gap": computed.get("gap"),
+                "breakpoint": sample.get("breakpoint"),
+            })
+        for sample in self._by_type.get("card", ()):
+            bbox = sample.get("bbox") or {}
+            width = bbox.get("width")
+            if width:
+                min_card_width.setdefault(sample.get("breakpoint"), []).append(width)
 
         for bp, values in min_card_width.items():
             if values:
@@ -1851,21 +2451,25 @@ class DesignSystemCollector:
         target_sizes = []
         contrast_samples = []
 
-        for sample in self.samples:
-            bbox = sample.get("bbox") or {}
-            if bbox.get("width") and bbox.get("height"):
-                if bbox.get("width") < 44 or bbox.get("height") < 44:
-                    target_sizes.append({
-                        "id": sample.get("id"),
-                        "component": sample.get("component_type"),
-                        "width": bbox.get("width"),
-                        "height": bbox.get("height"),
-                    })
+        samples = self.samples
+        color_table = self.color_table()
+        for idx, (width, height) in enumerate(zip(self._widths, self._heights)):
+            if width and height and (width < 44 or height < 44):
+                sample = samples[idx]
+                bbox = sample["bbox"]
+                target_sizes.append({
+                    "id": sample.get("id"),
+                    "component": sample.get("component_type"),
+                    "width": bbox.get("width"),
+                    "height": bbox.get("height"),
+                })
 
+        for sample in samples:
+            sample_id = sample.get("id")
             focus_state = (sample.get("states") or {}).get("focus_visible")
             if focus_state and isinstance(focus_state, dict) and "error" not in focus_state:
                 focus_rings.append({
-                    "id": sample.get("id"),
+                    "id": sample_id,
                     "outline": focus_state.get("outline-color"),
                     "outline_width": focus_state.get("outline-width"),
                     "outline_offset": focus_state.get("outline-offset"),
@@ -1873,12 +2477,12 @@ class DesignSystemCollector:
                 })
 
             computed = sample.get("computed", {})
-            fg = parse_color(computed.get("color", ""))
-            bg = parse_color(computed.get("background-color", ""))
+            fg = color_table.get(computed.get("color", ""))
+            bg = color_table.get(computed.get("background-color", ""))
             if fg and bg and bg[3] > 0.9:
-                ratio = contrast_ratio((fg[0], fg[1], fg[2]), (bg[0], bg[1], bg[2]))
+                ratio = contrast_ratio(fg[:3], bg[:3])
                 contrast_samples.append({
-                    "id": sample.get("id"),
+                    "id": sample_id,
                     "component": sample.get("component_type"),
                     "fg": color_to_string(fg),
                     "bg": color_to_string(bg),
@@ -1908,12 +2512,11 @@ class DesignSystemCollector:
         def simple_table(rows: List[Dict[str, Any]], columns: List[str]) -> str:
             if not rows:
                 return "(none)"
-            header = "| " + " | ".join(columns) + " |\n"
-            divider = "|" + "|".join([" --- " for _ in columns]) + "|\n"
-            body = ""
-            for row in rows[:10]:
-                body += "| " + " | ".join(str(row.get(col, "")) for col in columns) + " |\n"
-            return header + divider + body
+            lines = ["| " + " | ".join(columns) + " |", "|" + " --- |" * len(columns)]
+            lines.extend(
+                "| " + " | ".join(str(row.get(col, "")) for col in columns) + " |" for row in rows[:10]
+            )
+            return "\n".join(lines) + "\n"
 
         replacements = {
             "site_name": meta.get("site_name", ""),
@@ -1996,10 +2599,7 @@ class DesignSystemCollector:
             "limits_block": join_list(results.get("notes", [])),
         }
 
-        for key, value in replacements.items():
-            template = template.replace("{{" + key + "}}", str(value))
-
-        return template
+        return render_template(template, replacements)
 
     def render_guide(self, results: Dict[str, Any]) -> str:
         template = read_text(self.templates_dir / "guide.md")
@@ -2013,9 +2613,7 @@ class DesignSystemCollector:
             "limit": " | ".join(results.get("notes", [])),
             "owner_or_team": "",
         }
-        for key, value in replacements.items():
-            template = template.replace("{{" + key + "}}", str(value))
-        return template
+        return render_template(template, replacements)
 
     def render_ui_ux(self, results: Dict[str, Any]) -> str:
         template = read_text(self.templates_dir / "ui-ux.md")
@@ -2109,13 +2707,13 @@ class DesignSystemCollector:
             return f"neutrals {neutrals}; accents {accents}"
 
         def summarize_components() -> str:
-            component_types = sorted({s.get("component_type") for s in self.samples if s.get("component_type")})
+            component_types = self.component_types()
             return ", ".join(component_types) if component_types else "No component samples"
 
         interaction_summary, state_summary = summarize_interaction()
-        nav_samples = [s for s in self.samples if s.get("component_type") in {"navbar", "nav_link"}]
-        if nav_samples:
-            navigation_summary = f"nav samples {len(nav_samples)}"
+        nav_count = len(self._by_type.get("navbar", ())) + len(self._by_type.get("nav_link", ()))
+        if nav_count:
+            navigation_summary = f"nav samples {nav_count}"
         else:
             navigation_summary = "No navigation samples"
 
@@ -2143,9 +2741,7 @@ class DesignSystemCollector:
             "limits_block": join_list(results.get("notes", [])),
         }
 
-        for key, value in replacements.items():
-            template = template.replace("{{" + key + "}}", str(value))
-        return template
+        return render_template(template, replacements)
 
 
 async def main_async(args: argparse.Namespace) -> None:
@@ -2161,6 +2757,8 @@ async def main_async(args: argparse.Namespace) -> None:
         candidates_only=args.candidates_only,
         selected_paths=selected_paths,
         allow_anchor_active=args.allow_anchor_active,
+        max_parallel=args.parallel,
+        state_workers=args.state_workers,
     )
     await collector.collect_all()
 
@@ -2195,6 +2793,18 @@ def main() -> None:
         action="store_true",
         help="Allow active state sampling on anchor elements (may navigate)",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=3,
+        help="Maximum number of breakpoint/theme combinations collected concurrently",
+    )
+    parser.add_argument(
+        "--state-workers",
+        type=int,
+        default=2,
+        help="Pages per page/breakpoint/theme used to sample hover/focus/active states in parallel",
+    )
 
     args = parser.parse_args()
     asyncio.run(main_async(args))
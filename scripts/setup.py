@@ -4,50 +4,266 @@ Setup script for Design System Reverse Engineer.
 Installs Playwright and required dependencies.
 """
 
-import subprocess
 import sys
 
+# Fail fast, before importing anything else.
+if sys.version_info < (3, 8):
+    print("❌ Python 3.8+ required")
+    sys.exit(1)
+
+import importlib
+import importlib.util
+import json
+import os
+import re
+import subprocess
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Oldest playwright release setup accepts without reinstalling.
+MIN_PLAYWRIGHT_VERSION = (1, 40)
+# collect.py only launches headless Chromium; from this release on the
+# installer can fetch just the headless shell instead of the full browser.
+HEADLESS_SHELL_VERSION = (1, 49)
+# Browser downloads are retried on failure, backing off 5s, then 10s.
+BROWSER_INSTALL_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 5
+# Written into the browser cache after a complete setup; holds the playwright
+# version it was done for, so CI can key its cache on it and reruns can skip.
+VERSION_MARKER = ".playwright-version"
+
+
+def default_browsers_path(env: Dict[str, str]) -> Path:
+    """Playwright's per-user browser cache for this platform."""
+    if sys.platform == "win32":
+        return Path(env.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / "ms-playwright"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    return Path(env.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ms-playwright"
+
+
+def build_env() -> Dict[str, str]:
+    """Environment shared by every setup step."""
+    env = dict(os.environ)
+    # Pin the browser cache explicitly so the installer, the cache check and
+    # every virtualenv on this machine resolve the same directory.
+    env.setdefault("PLAYWRIGHT_BROWSERS_PATH", str(default_browsers_path(env)))
+    # pip runs unattended with its output piped: never prompt, skip the
+    # PyPI self-version lookup, and drop the redraw-heavy progress bar.
+    env.setdefault("PIP_NO_INPUT", "1")
+    env.setdefault("PIP_DISABLE_PIP_VERSION_CHECK", "1")
+    env.setdefault("PIP_PROGRESS_BAR", "off")
+    return env
+
+
+def playwright_version() -> Optional[Tuple[int, ...]]:
+    """Installed playwright version as an int tuple, or None."""
+    try:
+        raw = metadata.version("playwright")
+    except metadata.PackageNotFoundError:
+        return None
+    match = re.match(r"\d+(?:\.\d+)*", raw)
+    return tuple(int(part) for part in match.group(0).split(".")) if match else None
+
+
+def playwright_package_dir() -> Optional[Path]:
+    """Directory of the installed playwright package, or None."""
+    spec = importlib.util.find_spec("playwright")
+    if spec is None or not spec.origin:
+        return None
+    return Path(spec.origin).parent
+
+
+def browsers_path(env: Dict[str, str], package_dir: Path) -> Path:
+    """Where the Playwright installer puts browsers for this environment."""
+    configured = env.get("PLAYWRIGHT_BROWSERS_PATH")
+    if configured == "0":
+        return package_dir / "driver" / "package" / ".local-browsers"
+    if configured:
+        return Path(configured).expanduser()
+    return default_browsers_path(env)
+
+
+def chromium_installed(env: Dict[str, str], names: Tuple[str, ...]) -> bool:
+    """True when every pinned build among names is fully downloaded."""
+    package_dir = playwright_package_dir()
+    if package_dir is None:
+        return False
+    manifest = package_dir / "driver" / "package" / "browsers.json"
+    try:
+        browsers = json.loads(manifest.read_text(encoding="utf-8"))["browsers"]
+    except (OSError, ValueError, KeyError):
+        return False
+    wanted = [b for b in browsers if b.get("name") in names]
+    if not wanted:
+        return False
+    root = browsers_path(env, package_dir)
+    return all(
+        (root / f"{b['name'].replace('-', '_')}-{b['revision']}" / "INSTALLATION_COMPLETE").is_file()
+        for b in wanted
+    )
+
+
+def version_marker(env: Dict[str, str]) -> Optional[Path]:
+    """Path of the setup marker in the browser cache, or None without playwright."""
+    package_dir = playwright_package_dir()
+    if package_dir is None:
+        return None
+    return browsers_path(env, package_dir) / VERSION_MARKER
+
+
+def read_marker(env: Dict[str, str]) -> Optional[str]:
+    """Playwright version recorded by the last complete setup, if any."""
+    marker = version_marker(env)
+    if marker is None:
+        return None
+    try:
+        return marker.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def playwright_cli(env: Dict[str, str]) -> List[str]:
+    """Command prefix for the playwright CLI.
+
+    Calls the bundled driver directly, the same way ``python -m playwright``
+    does, to skip starting a second interpreter; falls back to the module
+    entry point when the driver helpers are unavailable.
+    """
+    try:
+        from playwright._impl._driver import compute_driver_executable, get_driver_env
+    except ImportError:
+        return [sys.executable, "-m", "playwright"]
+    driver = compute_driver_executable()
+    env.update((key, value) for key, value in get_driver_env().items() if key.startswith("PW_"))
+    return [str(part) for part in driver] if isinstance(driver, tuple) else [str(driver)]
+
+
+def start_precompile(package_dir: Path, env: Dict[str, str]) -> "subprocess.Popen[bytes]":
+    """Byte-compile package_dir across all cores in the background."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "compileall", "-q", "-j", "0", str(package_dir)],
+        stdout=subprocess.DEVNULL,
+        env=env,
+    )
+
 
-def run_command(cmd, description):
+def run_command(cmd: List[str], description: str, env: Dict[str, str]) -> bool:
     """Run a command and report status."""
     print(f"\n📦 {description}...")
+    # Stream output as it arrives instead of buffering the whole install log;
+    # stderr shares the pipe so errors stay in order with the progress lines.
     try:
-        result = subprocess.run(cmd, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed")
-        if result.stdout:
-            print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, env=env
+        )
+    except OSError as e:
+        print(f"❌ {description} failed: {e}")
+        return False
+    with proc:
+        for line in proc.stdout:
+            sys.stdout.write(line)
+    if proc.returncode != 0:
         print(f"❌ {description} failed")
-        if e.stderr:
-            print(e.stderr)
         return False
+    print(f"✅ {description} completed")
+    return True
+
+
+def run_with_retries(
+    cmd: List[str], description: str, env: Dict[str, str], attempts: int, delay: float
+) -> bool:
+    """run_command, retried with exponential backoff on failure."""
+    for attempt in range(1, attempts + 1):
+        if run_command(cmd, description, env):
+            return True
+        if attempt < attempts:
+            wait = delay * 2 ** (attempt - 1)
+            print(f"🔁 Retrying in {wait:g}s (attempt {attempt + 1} of {attempts})...")
+            time.sleep(wait)
+    return False
+
+
+def chromium_plan(version: Optional[Tuple[int, ...]]) -> Tuple[Tuple[str, ...], List[str]]:
+    """Browser builds collect.py needs and the installer arguments that fetch them."""
+    if version is not None and version >= HEADLESS_SHELL_VERSION:
+        return ("chromium-headless-shell",), ["install", "--only-shell", "chromium"]
+    return ("chromium", "chromium-headless-shell"), ["install", "chromium"]
+
 
+def print_complete(env: Dict[str, str]) -> None:
+    """Report success and where the browser cache lives."""
+    print("\n✅ Setup complete! You can now run:")
+    print("   python scripts/collect.py <url> --output ./artifacts")
+    print(f"\n   Browsers are cached in {env['PLAYWRIGHT_BROWSERS_PATH']}")
+    print("   (export PLAYWRIGHT_BROWSERS_PATH to share or move this cache)")
 
-def main():
+
+def main() -> None:
     print("🚀 Setting up Design System Reverse Engineer...")
 
-    # Check Python version
-    if sys.version_info < (3, 8):
-        print("❌ Python 3.8+ required")
-        sys.exit(1)
+    env = build_env()
 
-    # Install playwright
-    if not run_command(
-        f"{sys.executable} -m pip install playwright",
-        "Installing Playwright"
+    version = playwright_version()
+    version_text = ".".join(map(str, version)) if version else ""
+    if (
+        version_text
+        and read_marker(env) == version_text
+        and chromium_installed(env, chromium_plan(version)[0])
     ):
-        sys.exit(1)
+        print(f"\n✅ Playwright {version_text} and Chromium already set up, skipping install")
+        print_complete(env)
+        return
+
+    # Install playwright
+    precompile = None
+    if version is not None and version >= MIN_PLAYWRIGHT_VERSION:
+        print(f"\n✅ Playwright {version_text} already installed, skipping pip")
+    else:
+        requirement = "playwright>=" + ".".join(map(str, MIN_PLAYWRIGHT_VERSION))
+        if not run_command(
+            [sys.executable, "-m", "pip", "install", "--prefer-binary", "--no-compile", requirement],
+            "Installing Playwright",
+            env,
+        ):
+            sys.exit(1)
+        importlib.invalidate_caches()
+        version = playwright_version()
+        # pip skipped byte-compiling; do it in parallel with the browser download.
+        package_dir = playwright_package_dir()
+        if package_dir is not None:
+            precompile = start_precompile(package_dir, env)
 
     # Install chromium browser
-    if not run_command(
-        f"{sys.executable} -m playwright install chromium",
-        "Installing Chromium browser"
-    ):
+    browsers, install_args = chromium_plan(version)
+    if chromium_installed(env, browsers):
+        print("\n✅ Chromium already installed, skipping download")
+        browser_ok = True
+    else:
+        browser_ok = run_with_retries(
+            [*playwright_cli(env), *install_args],
+            "Installing Chromium browser",
+            env,
+            BROWSER_INSTALL_ATTEMPTS,
+            RETRY_DELAY_SECONDS,
+        )
+
+    if precompile is not None and precompile.wait() != 0:
+        print("⚠️ Precompiling Playwright failed; modules will compile on first import")
+    if not browser_ok:
         sys.exit(1)
 
-    print("\n✅ Setup complete! You can now run:")
-    print("   python scripts/collect.py <url> --output ./artifacts")
+    marker = version_marker(env)
+    if marker is not None and version is not None:
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(".".join(map(str, version)), encoding="utf-8")
+        except OSError:
+            pass
+
+    print_complete(env)
 
 
 if __name__ == "__main__":
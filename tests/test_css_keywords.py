@@ -0,0 +1,64 @@
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("playwright")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "collect.py"
+spec = importlib.util.spec_from_file_location("collect", SCRIPT)
+collect = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(collect)
+
+PATTERNS = [p for patterns in collect.CSS_KEYWORDS.values() for p in patterns]
+FILLER = ["", " ", "-", ".", "{", "}", ":", ";", "x", "color:red", "--tw-ring-", "layer", "-bs-", "-ant-", "\n"]
+
+
+def reference_scan(css_text):
+    """The original per-keyword substring counter."""
+    found = {}
+    lower = css_text.lower()
+    for framework, patterns in collect.CSS_KEYWORDS.items():
+        matches = [p for p in patterns if p.lower() in lower]
+        if matches:
+            found[framework] = {
+                "matches": matches,
+                "count": sum(lower.count(p.lower()) for p in patterns),
+            }
+    return found
+
+
+def make_css(rnd):
+    parts = []
+    for _ in range(rnd.randint(0, 60)):
+        piece = rnd.choice(PATTERNS) if rnd.random() < 0.5 else rnd.choice(FILLER)
+        parts.append(piece.upper() if rnd.random() < 0.1 else piece)
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_scan_css_keywords_matches_per_keyword_counts(tmp_path, seed):
+    collector = collect.DesignSystemCollector("https://example.com", str(tmp_path))
+    css = make_css(random.Random(seed))
+
+    assert collector.scan_css_keywords(css) == reference_scan(css)
+
+
+def test_keywords_sharing_a_boundary_are_all_counted(tmp_path):
+    collector = collect.DesignSystemCollector("https://example.com", str(tmp_path))
+    # "--bs-" and "--ant-" start on the last "-" of the keyword before them.
+    css = ".mui--tw--bs-x--chakra--ant-"
+
+    found = collector.scan_css_keywords(css)
+
+    assert found == reference_scan(css)
+    assert found["bootstrap"]["count"] == 1
+    assert found["antd"]["count"] == 1
+
+
+def test_self_overlapping_keyword_counts_like_str_count(tmp_path):
+    collector = collect.DesignSystemCollector("https://example.com", str(tmp_path))
+    css = "--ant--ant--ant-"
+
+    assert collector.scan_css_keywords(css) == reference_scan(css)
@@ -0,0 +1,71 @@
+import importlib.util
+import json
+import random
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("playwright")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "collect.py"
+spec = importlib.util.spec_from_file_location("collect", SCRIPT)
+collect = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(collect)
+
+
+def reference_density(collector):
+    """The original per-sample loop of build_density_rhythm."""
+    controls = defaultdict(list)
+    card_paddings = []
+    for sample in collector.samples:
+        bbox = sample.get("bbox") or {}
+        height = bbox.get("height")
+        if sample.get("component_type") in {"button", "input", "chip"} and height:
+            controls[sample["component_type"]].append(height)
+        if sample.get("component_type") == "card" and height:
+            card_paddings.append(height)
+    return {
+        "control_heights": {k: collector.stats_summary(v) for k, v in controls.items()},
+        "section_spacing": {"values": []},
+        "list_row_heights": {"values": []},
+        "card_padding_gaps": {"values": card_paddings},
+        "breakpoint_deltas": [],
+        "evidence": [],
+    }
+
+
+def make_samples(rnd):
+    samples = []
+    for idx in range(rnd.randint(0, 40)):
+        bbox = {"width": rnd.randint(10, 400)}
+        if rnd.random() < 0.6:
+            bbox["height"] = rnd.choice([rnd.randint(10, 80), rnd.uniform(10, 80), 0])
+        samples.append({
+            "id": f"s{idx}",
+            "component_type": rnd.choice(["button", "input", "chip", "card", "nav_link", None]),
+            "bbox": bbox if rnd.random() < 0.9 else None,
+            "computed": {},
+        })
+    return samples
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_density_rhythm_matches_sample_order_loop(tmp_path, seed):
+    collector = collect.DesignSystemCollector("https://example.com", str(tmp_path))
+    collector.ingest_samples(make_samples(random.Random(seed)))
+
+    # Serialize so that key order (control_heights insertion order) is compared too.
+    assert json.dumps(collector.build_density_rhythm()) == json.dumps(reference_density(collector))
+
+
+def test_control_heights_follow_first_sized_sample(tmp_path):
+    collector = collect.DesignSystemCollector("https://example.com", str(tmp_path))
+    collector.ingest_samples([
+        {"component_type": "chip", "bbox": {"height": 24}},
+        {"component_type": "button", "bbox": {}},
+        {"component_type": "input", "bbox": {"height": 36}},
+        {"component_type": "button", "bbox": {"height": 40}},
+    ])
+
+    assert list(collector.build_density_rhythm()["control_heights"]) == ["chip", "input", "button"]